@@ -0,0 +1,125 @@
+"""
+Chainfall - Asset loading (manifest, placeholders, progressive decode)
+"""
+import pygame
+import view
+from config import PLAYER_COLOR, BONE_WHITE, PROJECTILE_COLOR, COLD_GREEN
+
+# name -> (path, target size, placeholder color)
+ASSET_MANIFEST = {
+    'player': ('assets/player.png', (60, 60), PLAYER_COLOR),
+    'enemy': ('assets/enemy.png', (40, 40), BONE_WHITE),
+    'enemy_head': ('assets/enemy_head.png', (60, 60), (180, 50, 50)),  # Head is 1.5x larger
+    'projectile': ('assets/projectile.png', (16, 24), PROJECTILE_COLOR),
+    'orb': ('assets/orb.png', (20, 20), COLD_GREEN),
+}
+
+
+def _decode(path):
+    """Worker side: decode only. Conversion needs the display, so it stays on the main thread."""
+    return pygame.image.load(path)
+
+
+class AssetLoader:
+    """
+    Hands out placeholder surfaces immediately and fills them in place as
+    images finish decoding, so managers never need to be told about a swap.
+    An asset that fails to load becomes None, the cue for its owners to draw
+    their procedural fallback; World.refresh_assets() hands that out.
+    """
+    def __init__(self, manifest=ASSET_MANIFEST):
+        self.manifest = manifest
+        self.assets = {}
+        self.loaded = set()
+        self.failed = {}  # name -> error message
+        self._pending = {}  # name -> Future
+        self._executor = None
+
+        for name, (path, size, color) in manifest.items():
+            self.assets[name] = self._make_placeholder(view.size(*size), color)
+
+    def _make_placeholder(self, size, color):
+        surface = pygame.Surface(size, pygame.SRCALPHA)
+        pygame.draw.ellipse(surface, (*color, 120), surface.get_rect())
+        return surface
+
+    @property
+    def done(self):
+        return len(self.loaded) + len(self.failed) == len(self.manifest)
+
+    def progress(self):
+        return len(self.loaded) + len(self.failed), len(self.manifest)
+
+    # --- Desktop: decode PNGs on a thread pool ---
+
+    def start_threaded(self, max_workers=4):
+        from concurrent.futures import ThreadPoolExecutor  # Desktop only; the browser build never pays for it
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="asset")
+        for name, (path, size, color) in self.manifest.items():
+            self._pending[name] = self._executor.submit(_decode, path)
+
+    def poll(self):
+        """Install every decoded image that is ready. Call once per frame."""
+        if not self._pending:
+            return
+        for name, future in list(self._pending.items()):
+            if not future.done():
+                continue
+            del self._pending[name]
+            try:
+                self._install(name, future.result())
+            except Exception as e:
+                self._fail(name, e)
+
+        if not self._pending and self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    # --- Browser: one asset per event-loop turn ---
+
+    async def load_async(self):
+        import asyncio  # Already loaded by the browser entry point; the desktop build skips it
+        for name in self.manifest:
+            self._load_one(name)
+            # Let the main loop draw a frame between assets
+            await asyncio.sleep(0)
+
+    # --- Tools and headless runs: everything up front ---
+
+    def load_all(self):
+        for name in self.manifest:
+            self._load_one(name)
+
+    def _load_one(self, name):
+        try:
+            self._install(name, _decode(self.manifest[name][0]))
+        except Exception as e:
+            self._fail(name, e)
+
+    def _install(self, name, image):
+        path, size, color = self.manifest[name]
+        if pygame.display.get_surface() is not None:
+            image = image.convert_alpha()
+        image = pygame.transform.scale(image, view.size(*size))
+
+        placeholder = self.assets[name]
+        placeholder.fill((0, 0, 0, 0))
+        # Additive onto a cleared surface is an exact copy, alpha included
+        placeholder.blit(image, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
+        self.loaded.add(name)
+
+    def _fail(self, name, error):
+        path = self.manifest[name][0]
+        self.failed[name] = str(error)
+        self.assets[name] = None
+        print(f"Error loading asset '{name}' ({path}): {error}")
+
+    def draw_progress(self, screen):
+        """Thin loading bar along the bottom edge while assets stream in."""
+        if self.done:
+            return
+        count, total = self.progress()
+        width = screen.get_width()
+        bar_y = screen.get_height() - 6
+        pygame.draw.rect(screen, (40, 40, 40), (0, bar_y, width, 6))
+        pygame.draw.rect(screen, COLD_GREEN, (0, bar_y, width * count / total, 6))
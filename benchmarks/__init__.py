@@ -0,0 +1,13 @@
+"""
+Chainfall - Benchmarks
+
+Run from the repository root so the game modules import as they do in play:
+
+    python -m benchmarks.hotpaths --save       # record a baseline
+    python -m benchmarks.hotpaths --compare    # flag regressions against it
+"""
+import os
+
+# Benchmarks never open a window
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
@@ -0,0 +1,130 @@
+"""
+Chainfall - Entity memory and attribute-access benchmark
+
+Times construction, attribute reads and per-object updates for the entity
+classes, then reports traced bytes per instance (Python-side allocations
+only; sprite and font memory lives in SDL). Module chains are measured
+per link; pooled effects allocate nothing per spawn.
+
+    python -m benchmarks.entities [--save] [--compare] [--filter NAME] [--quick]
+"""
+import sys
+import tracemalloc
+from benchmarks import fixtures
+from benchmarks.harness import Case, make_parser, run_suite
+from entity_core import SegmentGroup, SnakeSegment
+from entity_module import ModuleChain
+from projectile import Projectile
+from combat import CombatManager
+
+COUNT = 1000
+DT = 1.0 / 60.0
+
+
+class _Anchor:
+    """Stands in for an EntityCore as the anchor of a ModuleChain."""
+    def get_position(self):
+        return (240.0, 100.0)
+
+
+_ANCHOR = _Anchor()
+
+# name -> constructor of one instance
+FACTORIES = {
+    'SnakeSegment': lambda i: SnakeSegment(float(i), 100.0),
+    'SegmentGroup': lambda i: SegmentGroup(),
+    'Projectile': lambda i: Projectile(float(i % 480), 700.0),
+}
+CHAIN_LINKS = 5000  # Far past the recursion limit of the old linked modules
+
+
+def build(name, count=COUNT):
+    fixtures.init()
+    factory = FACTORIES[name]
+    return [factory(i) for i in range(count)]
+
+
+def bytes_per_instance(name, count=COUNT):
+    fixtures.init()
+    factory = FACTORIES[name]
+    factory(0)  # Lazily created shared state is not per-instance cost
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [factory(i) for i in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    grown = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del objects
+    return grown / count
+
+
+def bytes_per_link(count=COUNT):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    chain = ModuleChain(_ANCHOR, count)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    grown = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del chain
+    return grown / count
+
+
+def _read_xy(objects):
+    total = 0.0
+    for o in objects:
+        total += o.x + o.y
+    return total
+
+
+def _update_all(objects):
+    for o in objects:
+        o.update(DT)
+
+
+def _spawn_damage_numbers(combat):
+    for i in range(COUNT):
+        combat.effects.spawn(combat.damage_number_id, float(i % 480), 300.0, 0.0, -80, 1)
+
+
+def _full_effects():
+    combat = CombatManager()
+    _spawn_damage_numbers(combat)
+    return combat
+
+
+def cases():
+    result = []
+    for name in FACTORIES:
+        result.append(Case(f"construct/{name}_x{COUNT}", lambda _, name=name: build(name), number=5))
+    for name in ('SnakeSegment', 'Projectile'):
+        result.append(Case(f"read_xy/{name}_x{COUNT}", _read_xy, setup=lambda name=name: build(name), number=50))
+    result.append(Case(f"update/Projectile_x{COUNT}", _update_all, setup=lambda: build('Projectile'), number=50))
+    result.append(Case(f"spawn/damage_numbers_x{COUNT}", _spawn_damage_numbers, setup=CombatManager, number=20))
+    result.append(Case("update/EffectPool_full", lambda combat: combat.update(DT), setup=_full_effects, number=50))
+    result.append(Case(f"update_render/SnakeSegment_x{COUNT}",
+                       lambda segs: [s.update_render(DT) for s in segs],
+                       setup=lambda: build('SnakeSegment'), number=50))
+    result.append(Case(f"construct/ModuleChain_{CHAIN_LINKS}links", lambda _: ModuleChain(_ANCHOR, CHAIN_LINKS), number=5))
+    result.append(Case(f"update/ModuleChain_{CHAIN_LINKS}links", lambda chain: chain.update(DT),
+                       setup=lambda: ModuleChain(_ANCHOR, CHAIN_LINKS), number=20))
+    result.append(Case(f"modules/ModuleChain_{CHAIN_LINKS}links", lambda chain: chain.modules(),
+                       setup=lambda: ModuleChain(_ANCHOR, CHAIN_LINKS), number=50))
+    return result
+
+
+def main(argv=None):
+    args = make_parser("entities").parse_args(argv)
+    code = run_suite(args, cases())
+
+    print("\nTraced memory per instance:")
+    for name in FACTORIES:
+        if args.filter and args.filter not in name:
+            continue
+        print(f"  {name:<16}{bytes_per_instance(name):>8.0f} B")
+    if not args.filter or args.filter in 'ModuleChain':
+        print(f"  {'ModuleChain':<16}{bytes_per_link():>8.0f} B per link")
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""
+Chainfall - Deterministic benchmark fixtures
+
+Builders return game objects in a known state without running the game for
+minutes first. Nothing here uses the clock or unseeded randomness.
+"""
+import math
+import random
+import pygame
+import timers
+from config import SCREEN_WIDTH, SCREEN_HEIGHT, SNAKE_SPACING, SNAKE_DROP_STEP, SNAKE_MAX_SEGMENTS
+from entity_core import BoneSnake, EntityManager
+from projectile import ProjectileManager
+from progression import ProgressionManager
+from player import Player
+from path_manager import Path
+from asset_loader import AssetLoader
+from world import World
+
+_assets = None
+
+
+def init():
+    """Fonts are created by several constructors; the display is needed for convert()."""
+    if not pygame.font.get_init():
+        pygame.font.init()
+    if not pygame.display.get_init():
+        pygame.display.init()
+    if pygame.display.get_surface() is None:
+        pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+
+def load_assets():
+    """Real sprites, loaded once per process (blocking)."""
+    global _assets
+    if _assets is None:
+        init()
+        loader = AssetLoader()
+        loader.load_all()
+        _assets = loader.assets
+    return _assets
+
+
+def raster_path(length, width=SCREEN_WIDTH, margin=60, step=2.0, start=(50.0, 50.0)):
+    """
+    Walk the snake's raster pattern (right, drop, left, drop, ...) from
+    `start` for `length` pixels, one point per `step` pixels. Returned
+    newest-first, the order BoneSnake.path_history uses.
+    """
+    x, y = start
+    direction = 1
+    points = [(x, y)]
+    travelled = 0.0
+    target_y = None
+    while travelled < length:
+        if target_y is None:
+            x += step * direction
+            if (direction == 1 and x > width - margin) or (direction == -1 and x < margin):
+                target_y = y + SNAKE_DROP_STEP
+        else:
+            y += step
+            if y >= target_y:
+                y = target_y
+                target_y = None
+                direction *= -1
+        points.append((x, y))
+        travelled += step
+    points.reverse()
+    return points
+
+
+def build_snake(n_segments, extra_history=10.0, image=None, head_image=None):
+    """
+    A BoneSnake with `n_segments` segments (head included) laid along a
+    raster path, grouped in fives like BoneSnake.update() does. The path is
+    `extra_history` pixels longer than the body needs.
+    """
+    init()
+    snake = BoneSnake(SCREEN_WIDTH, SCREEN_HEIGHT, image, head_image)
+    snake.path_history = raster_path((n_segments - 1) * SNAKE_SPACING + extra_history)
+    snake.head_x, snake.head_y = snake.path_history[0]
+    snake.prev_head_x, snake.prev_head_y = snake.head_x, snake.head_y
+
+    # Resume the raster walk where the path ends
+    (x0, y0), (x1, y1) = snake.path_history[1], snake.path_history[0]
+    if abs(y1 - y0) > abs(x1 - x0):
+        snake.start_drop(50.0 + (int((y1 - 50.0) / SNAKE_DROP_STEP) + 1) * SNAKE_DROP_STEP)
+        snake.direction = 1 if x1 < SCREEN_WIDTH / 2 else -1
+    else:
+        snake.direction = 1 if x1 > x0 else -1
+
+    # Through the snake's pool, like BoneSnake.update() spawns them
+    for _ in range(n_segments - 1):
+        if len(snake.current_group.segments) >= 5:
+            snake.current_group = snake.pool.group(20)
+            snake.groups.append(snake.current_group)
+        snake.segments.append(snake.pool.segment(snake.head_x, snake.head_y, snake.current_group))
+
+    place_segments(snake)
+    for seg in snake.segments:
+        seg.reset_render_pos()
+    return snake
+
+
+def place_segments(snake):
+    """The placement pass from BoneSnake.update(), on its own."""
+    snake.segments[0].x, snake.segments[0].y = snake.path_history[0]
+    path_idx = 0
+    for i in range(1, len(snake.segments)):
+        path_idx = snake._place_segment(i, path_idx)
+    return path_idx
+
+
+def build_entity_manager(n_segments, image=None, head_image=None):
+    init()
+    manager = EntityManager(SCREEN_WIDTH, SCREEN_HEIGHT, image, head_image)
+    manager.snake = build_snake(n_segments, image=image, head_image=head_image)
+    return manager
+
+
+def build_projectiles(count, seed=7, y_range=(SCREEN_HEIGHT - 200, SCREEN_HEIGHT - 100), image=None, travel=0.0):
+    """
+    Projectiles spread across the screen width, below the snake by default (all misses).
+    Each one was `travel` px lower before its last update (the length of its swept hit test).
+    """
+    rng = random.Random(seed)
+    manager = ProjectileManager(image)
+    for _ in range(count):
+        manager.spawn(rng.uniform(0, SCREEN_WIDTH), rng.uniform(*y_range))
+    for projectile in manager.projectiles:
+        projectile.prev_y = projectile.y + travel
+    return manager
+
+
+def build_player(image=None):
+    return Player(SCREEN_WIDTH, SCREEN_HEIGHT, image)
+
+
+def build_progression(orb_count, seed=11, y_range=(80, 300), image=None):
+    """ProgressionManager with `orb_count` orbs out of magnet range of the player (added unmerged)."""
+    init()
+    rng = random.Random(seed)
+    manager = ProgressionManager(SCREEN_WIDTH, SCREEN_HEIGHT, image)
+    for _ in range(orb_count):
+        manager.orbs.add(rng.uniform(20, SCREEN_WIDTH - 20), rng.uniform(*y_range), 15)
+    return manager
+
+
+def build_path(control_count=24, resolution=20, seed=3):
+    rng = random.Random(seed)
+    points = []
+    for i in range(control_count):
+        y = 50 + i * (SCREEN_HEIGHT - 100) / (control_count - 1)
+        x = SCREEN_WIDTH / 2 + math.sin(i * 0.9) * 150 + rng.uniform(-20, 20)
+        points.append((x, y))
+    return Path(points, resolution)
+
+
+def build_world(segments=SNAKE_MAX_SEGMENTS, projectiles=200, orbs=500, damage_numbers=100, seed=13):
+    """A heavy late-game World: full-length snake, full screen of shots, orbs and damage numbers."""
+    init()
+    rng_local = random.Random(seed)
+    world = World(SCREEN_WIDTH, SCREEN_HEIGHT)
+    world.entity_manager = build_entity_manager(segments)
+    world.projectile_manager = build_projectiles(projectiles, seed=seed, y_range=(40, SCREEN_HEIGHT - 100))
+    world.progression_manager = build_progression(orbs, seed=seed, y_range=(60, SCREEN_HEIGHT - 200))
+    combat = world.combat_manager
+    for _ in range(damage_numbers):
+        slot = combat.effects.spawn(combat.damage_number_id, rng_local.uniform(0, SCREEN_WIDTH),
+                                    rng_local.uniform(0, SCREEN_HEIGHT), 0.0, -80, 1)
+        combat.effects.born[slot] = timers.now() - rng_local.uniform(0, 0.7)
+    world.difficulty_manager.update(95.0)
+    return world
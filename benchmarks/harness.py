@@ -0,0 +1,129 @@
+"""
+Chainfall - Benchmark harness (timing, JSON baselines, regression check)
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import time
+
+import pygame
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+
+
+class Case:
+    """
+    One timed code path. `setup` builds fresh state for each repeat (not
+    timed); `fn(state)` is called `number` times per repeat.
+    """
+    def __init__(self, name, fn, setup=None, number=100, repeat=7):
+        self.name = name
+        self.fn = fn
+        self.setup = setup
+        self.number = number
+        self.repeat = repeat
+
+
+def measure(case, quick=False):
+    number = max(1, case.number // 10) if quick else case.number
+    repeat = 3 if quick else case.repeat
+    fn = case.fn
+    per_call = []
+    for _ in range(repeat):
+        state = case.setup() if case.setup else None
+        start = time.perf_counter()
+        for _ in range(number):
+            fn(state)
+        per_call.append((time.perf_counter() - start) / number)
+    return {
+        'median_us': round(statistics.median(per_call) * 1e6, 3),
+        'min_us': round(min(per_call) * 1e6, 3),
+        'number': number,
+        'repeat': repeat,
+    }
+
+
+def run_cases(cases, name_filter=None, quick=False):
+    results = {}
+    for case in cases:
+        if name_filter and name_filter not in case.name:
+            continue
+        results[case.name] = result = measure(case, quick)
+        print(f"{case.name:<44}{result['median_us']:>12.2f} us  (min {result['min_us']:.2f})")
+    return results
+
+
+def save_baseline(path, results):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    data = {
+        'meta': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'pygame': pygame.version.ver,
+            'machine': platform.machine(),
+            'created': time.strftime("%Y-%m-%d %H:%M:%S"),
+        },
+        'results': results,
+    }
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    print(f"Baseline written to {path}")
+
+
+def load_baseline(path):
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+def compare(results, baseline, threshold):
+    """Return [(name, baseline_us, current_us, change_pct)] for cases slower than threshold %."""
+    regressions = []
+    print(f"\n{'case':<44}{'baseline':>12}{'current':>12}{'change':>9}")
+    for name, result in results.items():
+        if name not in baseline:
+            print(f"{name:<44}{'-':>12}{result['median_us']:>12.2f}{'new':>9}")
+            continue
+        old = baseline[name]['median_us']
+        new = result['median_us']
+        change = (new - old) / old * 100.0 if old else 0.0
+        flag = "  REGRESSION" if change > threshold else ""
+        print(f"{name:<44}{old:>12.2f}{new:>12.2f}{change:>+8.1f}%{flag}")
+        if change > threshold:
+            regressions.append((name, old, new, change))
+    return regressions
+
+
+def make_parser(suite_name):
+    default_path = os.path.join(BASELINE_DIR, f"{suite_name}.json")
+    parser = argparse.ArgumentParser(description=f"Chainfall {suite_name} benchmarks")
+    parser.add_argument('--save', nargs='?', const=default_path, default=None, metavar='PATH',
+                        help="write results as the baseline")
+    parser.add_argument('--compare', nargs='?', const=default_path, default=None, metavar='PATH',
+                        help="compare results against a baseline")
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help="percent slowdown (median) that counts as a regression")
+    parser.add_argument('--filter', default=None, help="only run cases whose name contains this")
+    parser.add_argument('--quick', action='store_true', help="fewer iterations, for smoke runs")
+    return parser
+
+
+def run_suite(args, cases):
+    """Time, then save and/or compare. Returns a process exit code."""
+    results = run_cases(cases, args.filter, args.quick)
+
+    if args.save:
+        save_baseline(args.save, results)
+    if args.compare:
+        regressions = compare(results, load_baseline(args.compare), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.0f}%")
+            return 1
+        print(f"\nNo regressions above {args.threshold:.0f}%")
+    return 0
+
+
+def main(suite_name, cases, argv=None):
+    """Shared command line for benchmark modules. Returns a process exit code."""
+    return run_suite(make_parser(suite_name).parse_args(argv), cases)
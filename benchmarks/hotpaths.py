@@ -0,0 +1,168 @@
+"""
+Chainfall - Hot path microbenchmarks
+
+    python -m benchmarks.hotpaths [--save] [--compare] [--threshold 10] [--filter NAME] [--quick]
+"""
+import sys
+from benchmarks import fixtures
+from benchmarks.harness import Case, main
+from combat import CombatManager
+from config import PROJECTILE_SPEED, SNAKE_DROP_STEP, SNAKE_SPACING
+import snapshot
+import timers
+
+DT = 1.0 / 60.0
+
+
+def _snake_update_cases():
+    cases = []
+    for n in (25, 100, 500):
+        cases.append(Case(
+            f"snake.update/{n}seg",
+            lambda snake: snake.update(DT),
+            setup=lambda n=n: fixtures.build_snake(n),
+            number=200,
+        ))
+    return cases
+
+
+def _place_segment_cases():
+    # Long histories: the path runs well past the tail, as it does late in a session
+    cases = []
+    for n, extra in ((100, 5000.0), (500, 20000.0)):
+        cases.append(Case(
+            f"snake._place_segment/{n}seg_{int(extra)}px_tail",
+            fixtures.place_segments,
+            setup=lambda n=n, extra=extra: fixtures.build_snake(n, extra_history=extra),
+            number=50,
+        ))
+    return cases
+
+
+def _remove_segment_cases():
+    def setup(n, where):
+        def build():
+            snake = fixtures.build_snake(n)
+            groups = snake.groups
+            group = {'head': groups[0], 'middle': groups[len(groups) // 2], 'tail': groups[-1]}[where]
+            # Head segment is indestructible; target a body segment of the group
+            target = next(s for s in group.segments if not s.is_head)
+            return snake, target
+        return build
+
+    cases = []
+    for n in (100, 500):
+        for where in ('head', 'middle', 'tail'):
+            cases.append(Case(
+                f"snake.remove_segment/{n}seg_{where}",
+                lambda state: state[0].remove_segment(state[1]),
+                setup=setup(n, where),
+                number=1,
+                repeat=25,
+            ))
+    return cases
+
+
+def _collision_cases():
+    def setup(projectiles, segments):
+        def build():
+            return (CombatManager(), fixtures.build_projectiles(projectiles, travel=PROJECTILE_SPEED * DT),
+                    fixtures.build_entity_manager(segments))
+        return build
+
+    cases = []
+    for projectiles, segments in ((10, 25), (50, 100), (100, 100), (100, 500)):
+        cases.append(Case(
+            f"combat.check_collisions/{projectiles}proj_x_{segments}seg",
+            lambda state: state[0].check_collisions(state[1], state[2]),
+            setup=setup(projectiles, segments),
+            number=20,
+        ))
+    return cases
+
+
+def _path_cases():
+    def query_all(path):
+        step = path.total_length / 100
+        for i in range(100):
+            path.get_point(i * step)
+
+    return [Case("path.get_point/100_queries", query_all, setup=fixtures.build_path, number=20)]
+
+
+def _progression_cases():
+    def setup(orbs):
+        def build():
+            return fixtures.build_progression(orbs), fixtures.build_player()
+        return build
+
+    cases = []
+    for orbs in (100, 1000):
+        cases.append(Case(
+            f"progression.update/{orbs}orbs",
+            lambda state: state[0].update(DT, state[1]),
+            setup=setup(orbs),
+            number=50,
+        ))
+
+    # A burst of kills in one step: one per segment, SNAKE_SPACING apart in rows
+    def kill_row(manager):
+        for i in range(100):
+            manager.spawn_orb(20 + (i % 18) * SNAKE_SPACING, 100 + (i // 18) * SNAKE_DROP_STEP, 15)
+
+    cases.append(Case(
+        "progression.spawn_orb/100_kills",
+        kill_row,
+        setup=lambda: fixtures.build_progression(0),
+        number=20,
+    ))
+    return cases
+
+
+def _timer_cases():
+    # Long-lived timers that do not expire during the run: a tick should cost the same for 10 or 1000
+    def setup(count):
+        def build():
+            timers.reset()
+            running = [timers.Timer() for _ in range(count)]
+            for i, timer in enumerate(running):
+                timer.start(60.0 + i * 0.01)
+            return running
+        return build
+
+    cases = []
+    for count in (10, 1000):
+        cases.append(Case(
+            f"timers.advance/{count}running",
+            lambda running: timers.advance(DT),
+            setup=setup(count),
+            number=200,
+        ))
+    return cases
+
+
+def _snapshot_cases():
+    def setup():
+        world = fixtures.build_world()
+        return world, snapshot.snapshot(world)
+
+    return [
+        Case("snapshot.snapshot/late_game", lambda state: snapshot.snapshot(state[0]), setup=setup, number=50),
+        Case("snapshot.restore/late_game", lambda state: snapshot.restore(state[0], state[1]), setup=setup, number=10),
+    ]
+
+
+CASES = (
+    _snake_update_cases()
+    + _place_segment_cases()
+    + _remove_segment_cases()
+    + _collision_cases()
+    + _path_cases()
+    + _progression_cases()
+    + _timer_cases()
+    + _snapshot_cases()
+)
+
+
+if __name__ == "__main__":
+    sys.exit(main("hotpaths", CASES))
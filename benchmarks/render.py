@@ -0,0 +1,212 @@
+"""
+Chainfall - Headless render benchmark and golden-frame check
+
+Renders canned scenes through the real draw methods into an offscreen
+Surface, times each scene, and hashes the pixels so renderer changes can be
+shown to be pixel-identical.
+
+    python -m benchmarks.render                   # time scenes, check golden hashes
+    python -m benchmarks.render --update-golden   # accept the current output
+    python -m benchmarks.render --scale 0.5       # time at a reduced render scale
+"""
+import hashlib
+import json
+import os
+import random
+import sys
+import pygame
+from benchmarks import fixtures
+from benchmarks.harness import Case, make_parser, run_suite
+import timers
+import view
+from combat import CombatManager
+from config import SCREEN_WIDTH, SCREEN_HEIGHT, BG_COLOR
+
+GOLDEN_PATH = os.path.join(os.path.dirname(__file__), "golden", "render.json")
+
+
+def _snake_scene(assets):
+    def build():
+        image = assets.get('enemy') if assets else None
+        head = assets.get('enemy_head') if assets else None
+        snake = fixtures.build_snake(100, image=image, head_image=head)
+        # Mid-fight look: a few groups flashing, a few segments mid hit-pulse
+        for group in snake.groups[1::4]:
+            group.hp = 12
+            group.flash.start(0.2)
+        for seg in snake.segments[3::7]:
+            seg.hit_scale = 1.15
+        return snake.draw
+    return build
+
+
+def _projectile_scene(assets):
+    def build():
+        image = assets.get('projectile') if assets else None
+        manager = fixtures.build_projectiles(150, y_range=(40, SCREEN_HEIGHT - 40), image=image)
+        return manager.draw
+    return build
+
+
+def _progression_scene(assets):
+    def build():
+        image = assets.get('orb') if assets else None
+        manager = fixtures.build_progression(200, y_range=(60, SCREEN_HEIGHT - 60), image=image)
+        manager.experience = 40
+        pulses = manager.orbs.pulses
+        for i in range(len(pulses)):
+            pulses[i] = i * 0.37
+        return manager.draw
+    return build
+
+
+def _upgrade_scene():
+    manager = fixtures.build_progression(0)
+    manager.upgrade_active = True
+    manager.upgrade_options = manager.upgrade_pool[:3]
+    manager.selected_upgrade = 1
+    return manager.draw
+
+
+def _damage_scene():
+    rng = random.Random(5)
+    combat = CombatManager()
+    for i in range(60):
+        slot = combat.effects.spawn(combat.damage_number_id, rng.uniform(20, SCREEN_WIDTH - 20),
+                                    rng.uniform(60, SCREEN_HEIGHT - 60), 0.0, -80, rng.randint(1, 99))
+        combat.effects.born[slot] = timers.now() - (i % 8) * 0.1
+    return combat.draw
+
+
+def _full_scene(assets):
+    def build():
+        parts = [_snake_scene(assets)(), _projectile_scene(assets)(), _damage_scene(), _progression_scene(assets)()]
+        player = fixtures.build_player(assets.get('player') if assets else None)
+        parts.insert(2, player.draw)
+
+        def draw(surface):
+            for part in parts:
+                part(surface)
+        return draw
+    return build
+
+
+def scenes():
+    """name -> builder returning a draw(surface) callable."""
+    fixtures.init()
+    assets = fixtures.load_assets()
+    return {
+        'snake/sprites_100': _snake_scene(assets),
+        'snake/fallback_100': _snake_scene(None),
+        'projectiles/sprites_150': _projectile_scene(assets),
+        'projectiles/fallback_150': _projectile_scene(None),
+        'progression/sprites_200orbs': _progression_scene(assets),
+        'progression/fallback_200orbs': _progression_scene(None),
+        'progression/upgrade_screen': _upgrade_scene,
+        'combat/damage_numbers_60': _damage_scene,
+        'frame/sprites': _full_scene(assets),
+        'frame/fallback': _full_scene(None),
+    }
+
+
+def _render(draw, surface):
+    surface.fill(BG_COLOR)
+    draw(surface)
+
+
+def frame_hash(surface):
+    return hashlib.sha256(pygame.image.tobytes(surface, 'RGB')).hexdigest()
+
+
+def render_hashes(scene_builders):
+    surface = pygame.Surface(view.screen_size())
+    hashes = {}
+    for name, build in scene_builders.items():
+        _render(build(), surface)
+        hashes[name] = frame_hash(surface)
+    return hashes
+
+
+def _golden_meta():
+    return {'pygame': pygame.version.ver, 'sdl': ".".join(map(str, pygame.get_sdl_version()))}
+
+
+def check_golden(hashes, path=GOLDEN_PATH, dump_dir=None):
+    """Returns the names of scenes whose pixels differ from the golden file."""
+    if not os.path.exists(path):
+        print(f"No golden file at {path}; run with --update-golden to create it")
+        return []
+    with open(path) as f:
+        golden = json.load(f)
+    if golden.get('meta') != _golden_meta():
+        print(f"Note: golden frames were made with {golden.get('meta')}, running {_golden_meta()}")
+
+    mismatched = []
+    for name, digest in hashes.items():
+        expected = golden['frames'].get(name)
+        if expected is None:
+            status = "new"
+        elif expected == digest:
+            status = "ok"
+        else:
+            status = "DIFFERS"
+            mismatched.append(name)
+        print(f"  {name:<32}{status}")
+    return mismatched
+
+
+def update_golden(hashes, path=GOLDEN_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump({'meta': _golden_meta(), 'frames': hashes}, f, indent=2, sort_keys=True)
+    print(f"Golden frames written to {path}")
+
+
+def dump_frames(scene_builders, out_dir):
+    """Save each scene as PNG, for eyeballing a golden mismatch."""
+    os.makedirs(out_dir, exist_ok=True)
+    surface = pygame.Surface(view.screen_size())
+    for name, build in scene_builders.items():
+        _render(build(), surface)
+        pygame.image.save(surface, os.path.join(out_dir, name.replace('/', '_') + ".png"))
+    print(f"Frames written to {out_dir}")
+
+
+def main(argv=None):
+    parser = make_parser("render")
+    parser.add_argument('--update-golden', action='store_true', help="accept the current output as golden")
+    parser.add_argument('--no-golden', action='store_true', help="skip the pixel check")
+    parser.add_argument('--dump', metavar='DIR', default=None, help="also save every scene as PNG")
+    parser.add_argument('--scale', type=float, default=view.scale, help="render scale (golden frames are at 1.0)")
+    args = parser.parse_args(argv)
+    view.set_scale(args.scale)
+
+    scene_builders = scenes()
+    if args.filter:
+        scene_builders = {k: v for k, v in scene_builders.items() if args.filter in k}
+    surface = pygame.Surface(view.screen_size())
+    cases = [
+        Case(f"render/{name}", lambda draw: _render(draw, surface), setup=build, number=50, repeat=5)
+        for name, build in scene_builders.items()
+    ]
+    code = run_suite(args, cases)
+
+    if args.dump:
+        dump_frames(scene_builders, args.dump)
+    if args.no_golden or view.scale != 1:
+        return code
+
+    hashes = render_hashes(scene_builders)
+    if args.update_golden:
+        update_golden(hashes)
+        return code
+    print("\nGolden frames:")
+    mismatched = check_golden(hashes)
+    if mismatched:
+        print(f"{len(mismatched)} scene(s) render differently from the golden frames")
+        return 1
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""
+Chainfall - Cold-start benchmark (time to first frame)
+
+Every call starts a fresh interpreter, so imports, pygame initialization,
+the display, fonts and asset placeholders are all paid again, the way a
+player pays them before seeing anything. The game cases run an entry
+point's setup up to the end of the first rendered frame; the pygame case
+is the floor that is out of the game's hands.
+
+    python -m benchmarks.startup --save       # record a baseline
+    python -m benchmarks.startup --compare    # flag regressions against it
+"""
+import os
+import subprocess
+import sys
+from benchmarks.harness import Case, main
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Same setup as main_async.main(), stopping after the first frame
+DESKTOP = """
+import time
+from asset_loader import AssetLoader
+from game_loop import GameLoop
+loader = AssetLoader()
+game = GameLoop(loader)
+loader.start_threaded()
+while game.pacer.frames == 0:
+    time.sleep(game.delay())
+    game.frame()
+game.close()
+"""
+
+# Same setup as main.main() (the browser build), stopping after the first frame
+BROWSER = """
+import asyncio
+from asset_loader import AssetLoader
+from game_loop import GameLoop
+
+async def first_frame():
+    loader = AssetLoader()
+    game = GameLoop(loader, quit_on_escape=False)
+    loading = asyncio.create_task(loader.load_async())
+    while game.pacer.frames == 0:
+        await asyncio.sleep(game.delay())
+        game.frame()
+    game.close()
+    await loading
+
+asyncio.run(first_frame())
+"""
+
+
+def _run(code):
+    env = dict(os.environ, SDL_VIDEODRIVER='dummy', SDL_AUDIODRIVER='dummy')
+    subprocess.run([sys.executable, '-c', code], cwd=ROOT, env=env, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+CASES = (
+    Case("startup/import_pygame", lambda _: _run("import pygame"), number=1, repeat=7),
+    Case("startup/first_frame_desktop", lambda _: _run(DESKTOP), number=1, repeat=7),
+    Case("startup/first_frame_browser", lambda _: _run(BROWSER), number=1, repeat=7),
+)
+
+
+if __name__ == "__main__":
+    sys.exit(main("startup", CASES))
@@ -1,90 +1,109 @@
 """
 Chainfall - Combat system (collision, knockback, damage numbers)
 """
-import pygame
 import math
-import random
-
-class DamageNumber:
-    def __init__(self, x, y, damage):
-        self.x = x
-        self.y = y
-        self.damage = damage
-        self.lifetime = 0.8
-        self.timer = 0
-        self.velocity_y = -80
-        self.velocity_x = random.uniform(-30, 30)
-        self.active = True
-        self.font = None
-
-    def update(self, dt):
-        self.timer += dt
-        if self.timer >= self.lifetime:
-            self.active = False
-            return
-
-        self.y += self.velocity_y * dt
-        self.x += self.velocity_x * dt
-        self.velocity_y += 100 * dt  # Gravity
-
-    def draw(self, screen, font):
-        if not self.active:
-            return
-
-        alpha = 1.0 - (self.timer / self.lifetime)
-        color = (255, 255, 100)
-
-        text = font.render(str(int(self.damage)), True, color)
-        text.set_alpha(int(alpha * 255))
-        screen.blit(text, (int(self.x) - text.get_width() // 2, int(self.y)))
+import rng
+import telemetry
+from config import EFFECTS_CAPACITY
+from effects import DamageNumbers, EffectPool, HitBursts
+
+_random = rng.stream('combat')
+
+
+def _sweep(x0, y0, dx, dy, length_sq, cx, cy, r):
+    """
+    Fraction (0-1) of the move from (x0, y0) by (dx, dy) at which a point comes
+    within r of (cx, cy), or None if it never does. 0 if it starts inside.
+    """
+    fx = x0 - cx
+    fy = y0 - cy
+    c = fx * fx + fy * fy - r * r
+    if c < 0:
+        return 0.0
+    b = fx * dx + fy * dy
+    if b >= 0 or length_sq == 0:
+        return None  # Not moving, or moving away
+    disc = b * b - length_sq * c
+    if disc < 0:
+        return None
+    t = (-b - math.sqrt(disc)) / length_sq
+    return t if t <= 1.0 else None
 
 
 class CombatManager:
     def __init__(self):
-        self.damage_numbers = []
-        self.font = None
+        self.effects = EffectPool(EFFECTS_CAPACITY)
+        self.damage_numbers = DamageNumbers()
+        self.bursts = HitBursts()
+        self.damage_number_id = self.effects.register(self.damage_numbers)
+        self.burst_id = self.effects.register(self.bursts)
         self.projectile_damage = 10
-
-    def init_font(self):
-        if self.font is None:
-            self.font = pygame.font.Font(None, 28)
+        self.max_damage_numbers = None  # Load governor cap on live numbers
 
     def check_collisions(self, projectile_manager, entity_manager):
-        """Check projectile-entity collisions"""
-        self.init_font()
+        """
+        Check projectile-entity collisions. Each projectile is swept from where it
+        was before its last update to where it is now and hits the first target
+        along that path, so long steps and fast shots cannot tunnel through.
+        """
         hits = []
 
         projectiles = projectile_manager.get_projectiles()
         entities = entity_manager.get_entities()
+        targets = self._targets(entities)
 
         for projectile in projectiles:
             if not projectile.active:
                 continue
 
-            px, py = projectile.x, projectile.y
+            x0, y0 = projectile.prev_x, projectile.prev_y
+            dx = projectile.x - x0
+            dy = projectile.y - y0
+            length_sq = dx * dx + dy * dy
             pr = projectile.radius
 
-            # Check against all entities (segments)
-            for entity in entities:
-                if not entity.active:
+            # Box around the whole path, to skip far targets before the exact test
+            left = min(x0, projectile.x) - pr
+            right = max(x0, projectile.x) + pr
+            top = min(y0, projectile.y) - pr
+            bottom = max(y0, projectile.y) + pr
+
+            # Earliest contact along the path; ties go to the first in entity order
+            first = None
+            first_t = 2.0
+            for entity, ex, ey, er in targets:
+                if ex + er < left or ex - er > right or ey + er < top or ey - er > bottom:
                     continue
+                t = _sweep(x0, y0, dx, dy, length_sq, ex, ey, pr + er)
+                if t is not None and t < first_t:
+                    first = entity
+                    first_t = t
 
-                # Get position safely
-                if hasattr(entity, 'get_position'):
-                    ex, ey = entity.get_position()
-                else:
-                    ex, ey = entity.x, entity.y
-                
-                er = entity.get_radius() if hasattr(entity, 'get_radius') else 5
-
-                if self._circle_collision(px, py, pr, ex, ey, er):
-                    self._apply_hit(projectile, entity, entity_manager)
-                    hits.append(entity)
-                    # One projectile hits one target for now
-                    break
+            if first is not None:
+                hits.append(first)
+                if self._apply_hit(projectile, first, entity_manager):
+                    # A kill removes the whole group from the entity list
+                    targets = self._targets(entities)
 
         return hits
 
+    def _targets(self, entities):
+        """(entity, x, y, radius) for every active entity"""
+        targets = []
+        for entity in entities:
+            if not entity.active:
+                continue
+
+            # Get position safely
+            if hasattr(entity, 'get_position'):
+                ex, ey = entity.get_position()
+            else:
+                ex, ey = entity.x, entity.y
+
+            er = entity.get_radius() if hasattr(entity, 'get_radius') else 5
+            targets.append((entity, ex, ey, er))
+        return targets
+
     def _circle_collision(self, x1, y1, r1, x2, y2, r2):
         dx = x2 - x1
         dy = y2 - y1
@@ -99,14 +118,22 @@ class CombatManager:
         damage = 1 # Simple 1 damage per hit for now
         
         # Show Damage Number
-        if hasattr(target, 'x') and hasattr(target, 'y'):
-             self.damage_numbers.append(DamageNumber(target.x, target.y - 20, damage))
+        if hasattr(target, 'x') and hasattr(target, 'y') and (
+                self.max_damage_numbers is None
+                or self.effects.count(self.damage_number_id) < self.max_damage_numbers):
+             self.effects.spawn(self.damage_number_id, target.x, target.y - 20,
+                                _random.uniform(-30, 30), -80, damage)
 
         # Deal Damage
         if hasattr(target, 'take_damage'):
             is_destroyed = target.take_damage(damage)
+            telemetry.log(telemetry.HIT, damage)
             if is_destroyed:
                 destroyed = True
+                telemetry.log(telemetry.GROUP_DESTROYED)
+                if hasattr(target, 'x') and hasattr(target, 'y'):
+                    bursts = self.bursts
+                    self.effects.burst(self.burst_id, target.x, target.y, bursts.sparks, bursts.speed, 3)
                 if entity_manager and hasattr(entity_manager, 'remove_entity'):
                     entity_manager.remove_entity(target)
         else:
@@ -142,10 +169,7 @@ class CombatManager:
             target.y += dy * knockback_force * 0.3
 
     def update(self, dt):
-        for dn in self.damage_numbers:
-            dn.update(dt)
-
-        self.damage_numbers = [dn for dn in self.damage_numbers if dn.active]
+        self.effects.update(dt)
 
     def check_player_collision(self, player, entity_manager):
         """Check if any entity hits the player (Game Over condition)"""
@@ -169,6 +193,4 @@ class CombatManager:
         return False
 
     def draw(self, screen):
-        self.init_font()
-        for dn in self.damage_numbers:
-            dn.draw(screen, self.font)
+        self.effects.draw(screen)
@@ -7,6 +7,7 @@ SCREEN_WIDTH: int = 480
 SCREEN_HEIGHT: int = 800
 FPS: int = 60
 TITLE: str = "Chainfall: Necropolis"
+RENDER_SCALE: float = 1.0  # Draw at this fraction of the screen size and let SDL stretch it (e.g. 0.5, 0.75)
 
 # Colors (Necromantic Palette)
 BG_COLOR: tuple = (5, 5, 5)  # Pitch black/Darkest gray
@@ -29,12 +30,79 @@ PLAYER_Y_OFFSET: int = 60
 # Projectile
 PROJECTILE_RADIUS: int = 5
 PROJECTILE_SPEED: float = 600.0
+
+# Energy orbs
+ORB_MERGE_RADIUS: float = 32.0  # An orb spawned this close to a live one joins it (adds its XP)
+
+# Effects: damage numbers and hit bursts share one fixed pool; the oldest is replaced when full
+EFFECTS_CAPACITY: int = 256
+
 # Snake Physics (Horizontal Wave)
 SNAKE_SPEED_X: float = 60.0      # Slowed down from 120.0
 SNAKE_SPACING: float = 25.0
 SNAKE_DROP_STEP: int = 50        # How much to drop down
 SNAKE_LENGTH: int = 25           # Finite snake 
+SNAKE_MAX_SEGMENTS: int = 80     # Steady-state length: spawning stops here (the load governor can cap lower)
 SPRING_STIFFNESS: float = 160.0  # Variant C: Arcade (fast)
 RETURN_FORCE: float = 40.0
 DAMPING: float = 3.0             # Variant C: Less damping, more bounce
 MASS: float = 1.0
+
+# Profiler (F3 overlay, F4 CSV export)
+PROFILER_ENABLED: bool = False
+PROFILER_HISTORY: int = 600      # Frames kept in the ring buffer
+
+# Spike capture (F5): cProfile data kept only for frames over budget
+SPIKE_CAPTURE_ENABLED: bool = False
+SPIKE_BUDGET_MS: float = 25.0
+SPIKE_CAPTURE_MODE: str = "current"  # "current" (profile every frame) or "next" (profile after a spike)
+SPIKE_CAPTURE_FRAMES: int = 1       # Frames per capture
+SPIKE_CAPTURE_DIR: str = "spikes"
+SPIKE_MAX_CAPTURES: int = 20
+
+# Memory tracking (F6): tracemalloc growth and live object counts
+MEMTRACK_ENABLED: bool = False
+MEMTRACK_INTERVAL: float = 10.0  # Seconds of game time between samples
+MEMTRACK_LOG: str = "memtrack.csv"
+MEMTRACK_TOP: int = 10           # Lines shown in each growth report
+
+# Replay recording: per-tick input log for deterministic playback (replay.py)
+REPLAY_RECORD: bool = False
+RNG_SEED = None                  # None: fresh seed per session (recorded in the replay)
+
+# Snapshots: F7 saves the game state, F8 restores it
+SNAPSHOT_PATH: str = "quicksave.cfs"
+
+# Telemetry: gameplay and performance events, buffered and written to telemetry/ on game over, suspend and exit
+TELEMETRY_ENABLED: bool = False
+TELEMETRY_CAPACITY: int = 4096   # Events held between flushes; older ones are overwritten
+TELEMETRY_FORMAT: str = "jsonl"  # "jsonl" or "binary" (telemetry.load reads it back)
+
+# Frame pacing: the simulation steps at FPS; late frames catch up without rendering
+PACING_MAX_STEPS: int = 5              # Steps run back to back before simulation time is dropped
+PACING_REPORT_INTERVAL: float = 5.0    # Seconds between missed-deadline reports
+
+# Garbage collector scheduling: collect in spare frame time, not mid-frame
+GC_CONTROL_ENABLED: bool = True
+GC_THRESHOLDS: tuple = (10000, 50, 100)  # Automatic thresholds while playing (CPython default 700, 10, 10)
+GC_SLACK_MS: float = 4.0                 # Spare time a frame needs before a young collection runs in it
+GC_QUIET_INTERVAL: float = 5.0           # Seconds between full collections on the upgrade screen / game over
+
+# Load governor: sheds load in steps when frames run over budget
+GOVERNOR_ENABLED: bool = True
+GOVERNOR_BUDGET_MS: float = 14.0          # Mean work per frame (sleep excluded) that triggers the next level
+GOVERNOR_WINDOW: int = 30                 # Frames averaged per decision
+GOVERNOR_RESTORE_RATIO: float = 0.6       # Step back up once the mean falls below this share of the budget...
+GOVERNOR_RESTORE_WINDOWS: int = 4         # ...for this many windows in a row
+GOVERNOR_MAX_DAMAGE_NUMBERS: int = 20     # Level 1
+GOVERNOR_ORB_MERGE_RADIUS: float = 64.0   # Level 3
+GOVERNOR_MAX_SEGMENTS: int = 60           # Level 4
+
+# Parallel update: independent managers step on a thread pool (free-threaded Python only, sequential elsewhere)
+PARALLEL_UPDATE: bool = False
+PARALLEL_WORKERS: int = 4
+
+# Low-latency input: wake just in time so input is sampled right before the update and present
+LOW_LATENCY_INPUT: bool = False
+LOW_LATENCY_MARGIN_MS: float = 1.0  # Added to the predicted frame work when choosing the wake-up time
+DISPLAY_VSYNC: bool = False         # Present on vblank (needs the SCALED renderer)
@@ -1,6 +1,8 @@
 """
 Chainfall - Difficulty scaling system
 """
+import telemetry
+from timers import Timer
 
 class DifficultyManager:
     def __init__(self):
@@ -22,18 +24,20 @@ class DifficultyManager:
         self.spawn_delay = self.base_spawn_delay
 
         # Spawn timer
-        self.spawn_timer = 0
+        self.spawn = Timer(self._spawn_due)
+        self.spawn.start(self.spawn_delay)
+        self.spawn_ready = False
         self.max_enemies = 1
 
     def update(self, dt):
         self.game_time += dt
-        self.spawn_timer += dt
 
         # Increase difficulty every 30 seconds
         new_level = int(self.game_time / 30) + 1
         if new_level > self.difficulty_level:
             self.difficulty_level = new_level
             self._scale_difficulty()
+            telemetry.log(telemetry.DIFFICULTY_CHANGE, new_level)
 
     def _scale_difficulty(self):
         """Scale difficulty based on current level"""
@@ -57,10 +61,14 @@ class DifficultyManager:
         # Max enemies: +1 every 3 levels
         self.max_enemies = 1 + (level - 1) // 3
 
+    def _spawn_due(self):
+        self.spawn_ready = True
+
     def should_spawn(self):
         """Check if it's time to spawn a new enemy"""
-        if self.spawn_timer >= self.spawn_delay:
-            self.spawn_timer = 0
+        if self.spawn_ready:
+            self.spawn_ready = False
+            self.spawn.start(self.spawn_delay)
             return True
         return False
 
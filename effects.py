@@ -0,0 +1,189 @@
+"""
+Chainfall - Pooled short-lived effects (damage numbers, hit bursts)
+
+One EffectPool holds every live effect in fixed-capacity parallel arrays
+used as a ring buffer: spawning writes the next slot, and when the pool is
+full the oldest effect is overwritten, so nothing is allocated per hit.
+What an effect looks like is its kind's job. A kind pre-renders one sprite
+per (value, alpha step) the first time it is needed, and the whole pool is
+drawn with a single blits() call.
+"""
+import math
+import pygame
+from array import array
+import timers
+import view
+
+ALPHA_STEPS = 16  # Fade levels; sprites are cached per level
+
+
+class EffectKind:
+    """How one kind of effect moves and looks. Register it on a pool before spawning."""
+    lifetime = 0.5
+    gravity = 0.0
+
+    def __init__(self):
+        self._sprites = {}  # (value, alpha step) -> (surface, dx, dy)
+
+    def sprite(self, value, step):
+        key = (value, step)
+        cached = self._sprites.get(key)
+        if cached is None:
+            surface = self.render(value)
+            if step < ALPHA_STEPS:
+                surface = surface.copy()
+                surface.set_alpha(int(step / ALPHA_STEPS * 255))
+            cached = self._sprites[key] = (surface,) + self.anchor(surface)
+        return cached
+
+    def render(self, value):
+        """The fully opaque sprite for value. The base kind draws nothing."""
+        return pygame.Surface((0, 0), pygame.SRCALPHA)
+
+    def anchor(self, surface):
+        """Offset from the effect's position to the sprite's top-left corner."""
+        return (-(surface.get_width() // 2), -(surface.get_height() // 2))
+
+
+class DamageNumbers(EffectKind):
+    lifetime = 0.8
+    gravity = 100
+    color = (255, 255, 100)
+
+    def __init__(self):
+        super().__init__()
+        self.font = None
+
+    def render(self, value):
+        if self.font is None:
+            self.font = view.font(28)
+        return self.font.render(str(value), True, self.color)
+
+    def anchor(self, surface):
+        return (-(surface.get_width() // 2), 0)  # Centered horizontally, hanging from the hit point
+
+
+class HitBursts(EffectKind):
+    """Sparks thrown out when a segment group is destroyed. value is the spark radius."""
+    lifetime = 0.35
+    color = (220, 220, 210)
+    sparks = 6
+    speed = 140
+
+    def render(self, value):
+        radius = max(1, round(value * view.scale))
+        surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(surface, self.color, (radius, radius), radius)
+        return surface
+
+
+class EffectPool:
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.kinds = []
+        self.live = array('b', [0]) * capacity
+        self.kind = array('b', [0]) * capacity
+        self.xs = array('d', [0.0]) * capacity
+        self.ys = array('d', [0.0]) * capacity
+        self.velocity_xs = array('d', [0.0]) * capacity
+        self.velocity_ys = array('d', [0.0]) * capacity
+        self.born = array('d', [0.0]) * capacity  # Game time (timers.now()) the effect spawned
+        self.values = array('i', [0]) * capacity
+        self.head = 0    # Next slot to write; the oldest effect when the pool is full
+        self.counts = []  # Live effects per kind
+
+    def register(self, kind):
+        """Add a kind; returns the id to spawn it with."""
+        self.kinds.append(kind)
+        self.counts.append(0)
+        return len(self.kinds) - 1
+
+    def __len__(self):
+        return sum(self.counts)
+
+    def count(self, kind_id):
+        return self.counts[kind_id]
+
+    def spawn(self, kind_id, x, y, velocity_x, velocity_y, value=0):
+        """Start an effect in the next slot, replacing the oldest one if the pool is full. Returns the slot."""
+        slot = self.head
+        self.head = (slot + 1) % self.capacity
+        if self.live[slot]:
+            self.counts[self.kind[slot]] -= 1
+        self.live[slot] = 1
+        self.kind[slot] = kind_id
+        self.xs[slot] = x
+        self.ys[slot] = y
+        self.velocity_xs[slot] = velocity_x
+        self.velocity_ys[slot] = velocity_y
+        self.born[slot] = timers.now()
+        self.values[slot] = value
+        self.counts[kind_id] += 1
+        return slot
+
+    def burst(self, kind_id, x, y, count, speed, value=0):
+        """count effects flying out evenly from (x, y)."""
+        step = 2 * math.pi / count
+        for i in range(count):
+            angle = i * step
+            self.spawn(kind_id, x, y, math.cos(angle) * speed, math.sin(angle) * speed, value)
+
+    def update(self, dt):
+        now = timers.now()
+        live = self.live
+        kind = self.kind
+        xs = self.xs
+        ys = self.ys
+        velocity_xs = self.velocity_xs
+        velocity_ys = self.velocity_ys
+        born = self.born
+        lifetimes = [k.lifetime for k in self.kinds]
+        falls = [k.gravity * dt for k in self.kinds]
+
+        for i in range(self.capacity):
+            if not live[i]:
+                continue
+            k = kind[i]
+            if born[i] + lifetimes[k] <= now:
+                live[i] = 0
+                self.counts[k] -= 1
+                continue
+            ys[i] += velocity_ys[i] * dt
+            xs[i] += velocity_xs[i] * dt
+            velocity_ys[i] += falls[k]
+
+    def draw(self, screen):
+        now = timers.now()
+        live = self.live
+        kind = self.kind
+        xs = self.xs
+        ys = self.ys
+        born = self.born
+        values = self.values
+        kinds = self.kinds
+        s = view.scale
+        batch = []
+
+        # Oldest first, so newer effects draw on top (negative indices wrap around the ring)
+        for i in range(self.head - self.capacity, self.head):
+            if not live[i]:
+                continue
+            effect = kinds[kind[i]]
+            alpha = 1.0 - (now - born[i]) / effect.lifetime
+            step = min(max(int(alpha * ALPHA_STEPS + 0.5), 0), ALPHA_STEPS)
+            surface, dx, dy = effect.sprite(values[i], step)
+            batch.append((surface, (int(xs[i] * s) + dx, int(ys[i] * s) + dy)))
+
+        if batch:
+            screen.blits(batch, doreturn=False)
+
+    def columns(self):
+        """Every per-slot array, in a fixed order (snapshots rely on it)."""
+        return (self.live, self.kind, self.xs, self.ys, self.velocity_xs, self.velocity_ys, self.born, self.values)
+
+    def recount(self):
+        """Rebuild the per-kind live counts after the arrays were replaced."""
+        self.counts = [0] * len(self.kinds)
+        for live, kind in zip(self.live, self.kind):
+            if live:
+                self.counts[kind] += 1
@@ -3,15 +3,28 @@ Chainfall - Entity Core (Raster Snake Movement with Path History)
 """
 import pygame
 import math
-from config import SNAKE_SPEED_X, SNAKE_SPACING, SNAKE_DROP_STEP, SNAKE_LENGTH, SPRING_STIFFNESS, RETURN_FORCE, DAMPING, MASS, SCREEN_WIDTH, SCREEN_HEIGHT
+import shapes
+import view
+from timers import Timer
+from config import SNAKE_SPEED_X, SNAKE_SPACING, SNAKE_DROP_STEP, SNAKE_LENGTH, SNAKE_MAX_SEGMENTS, SPRING_STIFFNESS, RETURN_FORCE, DAMPING, MASS, SCREEN_WIDTH, SCREEN_HEIGHT
+
+_SPAWN_BUFFER = 15  # Path points past the tail (approx 30px) that spawn a new segment
 
 
 class SegmentGroup:
+    __slots__ = ('hp', 'max_hp', 'segments', 'flash')
+
     def __init__(self, start_hp=20):
+        self.segments = [] # List of SnakeSegment objects
+        self.flash = Timer()
+        self.reset(start_hp)
+
+    def reset(self, start_hp=20):
+        """Back to a fresh, empty group (SegmentPool reuses destroyed groups)"""
         self.hp = start_hp
         self.max_hp = start_hp
-        self.segments = [] # List of SnakeSegment objects
-        self.flash_timer = 0.0
+        self.segments.clear()
+        self.flash.stop()
         
     def add_segment(self, segment):
         self.segments.append(segment)
@@ -19,27 +32,32 @@ class SegmentGroup:
         
     def take_damage(self, amount):
         self.hp -= amount
-        self.flash_timer = 0.25 # Flash red for 0.25s
+        self.flash.start(0.25) # Flash red for 0.25s
         if self.hp <= 0:
             return True # Destroyed
         return False
-        
-    def update(self, dt):
-        if self.flash_timer > 0:
-            self.flash_timer -= dt
 
 class SnakeSegment:
+    __slots__ = ('x', 'y', 'image', 'head_image', 'active', 'velocity_y', 'group', 'is_head',
+                 'facing_angle', 'facing_dir', 'render_x', 'render_y', 'vel_rx', 'vel_ry',
+                 'hit_scale', 'hit')
+
+    radius = 20
+    font = None  # HP label font, shared by every segment (created on first draw)
+
     def __init__(self, x, y, image=None, group=None, is_head=False, head_image=None):
+        self.hit = Timer(self.end_hit)
+        self.reset(x, y, image, group, is_head, head_image)
+
+    def reset(self, x, y, image=None, group=None, is_head=False, head_image=None):
+        """Back to a freshly spawned segment (SegmentPool reuses destroyed segments)"""
         self.x = x
         self.y = y
         self.image = image
         self.head_image = head_image  # Separate sprite for head
         self.active = True
-        self.radius = 20
         self.velocity_y = 0.0 
         self.group = group # Reference to SegmentGroup
-        self.font = pygame.font.Font(None, 24)
-        self.is_head = is_head  # Head is visually distinct and indestructible
         self.is_head = is_head  # Head is visually distinct and indestructible
         self.facing_angle = 0  # Legacy angle, unused for head logic now.
         self.facing_dir = "RIGHT" # "RIGHT", "LEFT", "UP", "DOWN"
@@ -52,10 +70,12 @@ class SnakeSegment:
         
         # Hit scale effect
         self.hit_scale = 1.0
-        self.hit_timer = 0.0
+        self.hit.stop()
 
     def draw(self, screen, offset_y=0):
-        draw_y = self.render_y + offset_y
+        s = view.scale
+        draw_x = self.render_x * s
+        draw_y = (self.render_y + offset_y) * s
         
         # Determine which image to use
         if self.is_head and self.head_image:
@@ -64,7 +84,7 @@ class SnakeSegment:
             draw_image = self.image
         
         # Flash effect
-        if self.group and self.group.flash_timer > 0 and draw_image:
+        if self.group and self.group.flash.running and draw_image:
              draw_image = draw_image.copy()
              draw_image.fill((255, 50, 50, 150), special_flags=pygame.BLEND_RGBA_MULT)
              
@@ -87,14 +107,16 @@ class SnakeSegment:
                      draw_image = pygame.transform.rotate(draw_image, 90)
                  # RIGHT is default (no change)
 
-             rect = draw_image.get_rect(center=(int(self.render_x), int(draw_y)))
+             rect = draw_image.get_rect(center=(int(draw_x), int(draw_y)))
              if screen: screen.blit(draw_image, rect)
         else:
              # Fallback circle - head is 1.5x larger and different color
              base_scale = 1.5 if self.is_head else 1.0
-             draw_radius = int(self.radius * base_scale * self.hit_scale)
+             draw_radius = int(self.radius * base_scale * self.hit_scale * s)
              head_color = (180, 50, 50) if self.is_head else (220, 220, 210)
-             if screen: pygame.draw.circle(screen, head_color, (int(self.render_x), int(draw_y)), draw_radius)
+             if screen:
+                  surface, dx, dy = shapes.circle(head_color, draw_radius)
+                  screen.blit(surface, (int(draw_x) + dx, int(draw_y) + dy))
         
         # Draw HP only on the middle segment of the group
         if self.group and len(self.group.segments) > 0:
@@ -104,8 +126,10 @@ class SnakeSegment:
                        color = (255, 100, 100)
                   else:
                        color = (200, 200, 200)
-                  text = self.font.render(str(self.group.hp), True, color)
-                  if screen: screen.blit(text, (self.render_x - 5, self.render_y - 15))
+                  if SnakeSegment.font is None:
+                       SnakeSegment.font = view.font(24)
+                  text = SnakeSegment.font.render(str(self.group.hp), True, color)
+                  if screen: screen.blit(text, ((self.render_x - 5) * s, (self.render_y - 15) * s))
 
     def take_damage(self, amount):
         # Head is indestructible
@@ -113,11 +137,14 @@ class SnakeSegment:
             return False
         # Trigger hit scale effect
         self.hit_scale = 1.15
-        self.hit_timer = 0.1
+        self.hit.start(0.1)
         if self.group:
             return self.group.take_damage(amount)
         return False
 
+    def end_hit(self):
+        self.hit_scale = 1.0
+
     def update_render(self, dt, snap_active=False, freeze_active=False):
         """Spring physics for visual smoothing"""
         # HEAD OR FREEZE: instant follow (no spring delay)
@@ -213,6 +240,50 @@ class SnakeSegment:
             return True
         return False
 
+class SegmentPool:
+    """
+    Destroyed groups and their segments, kept for reuse. The snake spawns and
+    loses segments all game long; once warmed up, spawning takes them from
+    here instead of allocating.
+    """
+    def __init__(self, image=None, warm=0):
+        self.image = image
+        self.free_groups = []
+        self.free_segments = []
+        self.warm(warm)
+
+    def warm(self, count):
+        """Pre-create `count` segments and enough groups to hold them, plus the partly filled head and tail groups."""
+        for _ in range(count):
+            self.free_segments.append(SnakeSegment(0.0, 0.0, self.image))
+        for _ in range(count // 5 + 2):
+            self.free_groups.append(SegmentGroup())
+
+    def group(self, start_hp=20):
+        if not self.free_groups:
+            return SegmentGroup(start_hp)
+        group = self.free_groups.pop()
+        group.reset(start_hp)
+        return group
+
+    def segment(self, x, y, group, is_head=False, head_image=None):
+        """A fresh segment at (x, y), added to group."""
+        if self.free_segments:
+            seg = self.free_segments.pop()
+            seg.reset(x, y, self.image, is_head=is_head, head_image=head_image)
+        else:
+            seg = SnakeSegment(x, y, self.image, is_head=is_head, head_image=head_image)
+        group.add_segment(seg)
+        return seg
+
+    def release(self, group):
+        """Take back a destroyed group and its body segments. The head is never released."""
+        for seg in group.segments:
+            if not seg.is_head:
+                self.free_segments.append(seg)
+        self.free_groups.append(group)
+
+
 class BoneSnake:
     def __init__(self, screen_width, screen_height, segment_image=None):
         self.screen_width = screen_width
@@ -252,9 +323,12 @@ class BoneSnake:
         self.state = "MOVING" # MOVING, DROPPING
         self.target_y = 0
         self.target_y = 0
-        self.snap_timer = 0.0  # Timer for reduced spring during snap-back
-        self.snap_timer = 0.0  # Timer for reduced spring during snap-back
-        self.freeze_timer = 0.0 # Timer to freeze spring physics for 1 frame
+        self.snap = Timer()    # Reduced spring during snap-back
+        self.freeze = Timer()  # Spring physics frozen for a few frames
+
+        # Load governor knobs
+        self.max_segments = SNAKE_MAX_SEGMENTS  # Stop spawning past this many segments
+        self.springs = True       # False: segments render exactly on the path
         
         # Head tracking for rotation
         self.prev_head_x = 0
@@ -274,13 +348,15 @@ class BoneSnake:
         # Path History: List of (x, y) tuples
         self.path_history = [(start_x, start_y)]
              
+        # Destroyed groups are recycled; warm enough for a steady-state snake up front
+        self.pool = SegmentPool(self.image, warm=SNAKE_MAX_SEGMENTS)
+
         # Create Head Segment Group
-        self.current_group = SegmentGroup(start_hp=20)
+        self.current_group = self.pool.group(20)
         self.groups.append(self.current_group)
         
         # First segment is the HEAD (visually distinct, indestructible)
-        head_seg = SnakeSegment(start_x, start_y, self.image, group=self.current_group, is_head=True, head_image=self.head_image)
-        self.current_group.add_segment(head_seg)
+        head_seg = self.pool.segment(start_x, start_y, self.current_group, is_head=True, head_image=self.head_image)
         self.segments.append(head_seg)
             
     def remove_segment(self, segment):
@@ -309,12 +385,19 @@ class BoneSnake:
         
         if group in self.groups:
             self.groups.remove(group)
+            self.pool.release(group)
+        if group is self.current_group:
+            self.current_group = None  # The next spawn starts a fresh group, not one from the pool
         
         # Trigger reduced spring stiffness for smooth snap-back
         # Trigger reduced spring stiffness for smooth snap-back
-        self.snap_timer = 0.15
-        self.freeze_timer = 0.05 # FREEZE physics for 0.05s (approx 3 frames @ 60fps) to prevent glitch
+        self.snap.start(0.15)
+        self.freeze.start(0.05) # FREEZE physics for 0.05s (approx 3 frames @ 60fps) to prevent glitch
         
+        # The head can follow a group without being listed in it; it must not keep one that goes back to the pool
+        if self.segments and self.segments[0].is_head and self.segments[0].group is group:
+            self.segments[0].group = None
+
         # If head lost its group, assign it to the next available group (or create new one)
         if self.segments and self.segments[0].is_head and self.segments[0].group is None:
             if len(self.groups) > 0:
@@ -322,7 +405,7 @@ class BoneSnake:
                 self.segments[0].group = self.groups[0]
             else:
                 # Create new group for head
-                new_group = SegmentGroup(start_hp=20)
+                new_group = self.pool.group(20)
                 self.groups.append(new_group)
                 self.segments[0].group = new_group
 
@@ -452,11 +535,9 @@ class BoneSnake:
 
         if not self.segments:
              # Fallback: Respawn head if all segments destroyed (shouldn't happen with protected head)
-             self.current_group = SegmentGroup(start_hp=20)
+             self.current_group = self.pool.group(20)
              self.groups.append(self.current_group)
-             head_seg = SnakeSegment(self.head_x, self.head_y, self.image, group=self.current_group, is_head=True, head_image=self.head_image)
-             head_seg.reset_render_pos() # Ensure no jump
-             self.current_group.add_segment(head_seg)
+             head_seg = self.pool.segment(self.head_x, self.head_y, self.current_group, is_head=True, head_image=self.head_image)
              self.segments.append(head_seg)
              
         self.segments[0].x = self.path_history[0][0]
@@ -464,37 +545,27 @@ class BoneSnake:
         
         for i in range(1, len(self.segments)):
             current_path_idx = self._place_segment(i, current_path_idx)
-            
-        # Check if we need more segments
-        if len(self.path_history) - current_path_idx > 15: # Arbitrary buffer (approx 30px)
+
+        # Nothing follows the tail: keep only enough path past it for the spawn check below
+        del self.path_history[current_path_idx + _SPAWN_BUFFER + 2:]
+
+        # Check if we need more segments (unless capped at the steady-state length or by the load governor)
+        capped = self.max_segments is not None and len(self.segments) >= self.max_segments
+        if len(self.path_history) - current_path_idx > _SPAWN_BUFFER and not capped:
              # Adds a new segment at the end
              last_x, last_y = self.segments[-1].x, self.segments[-1].y
              
              # Group Logic
              if not self.current_group or len(self.current_group.segments) >= 5:
-                  self.current_group = SegmentGroup(start_hp=20)
+                  self.current_group = self.pool.group(20)
                   self.groups.append(self.current_group)
 
-             new_seg = SnakeSegment(last_x, last_y, self.image, group=self.current_group)
-             new_seg.reset_render_pos() # Ensure no jump
-             self.current_group.add_segment(new_seg)
+             new_seg = self.pool.segment(last_x, last_y, self.current_group) # Spawns with render pos on it, no jump
              self.segments.append(new_seg)
 
-        # Update Groups (Timers)
-        for group in self.groups:
-            group.update(dt)
-        
-        # Update snap timer
-        if self.snap_timer > 0:
-            self.snap_timer -= dt
-
-        # Update freeze timer
-        if self.freeze_timer > 0:
-            self.freeze_timer -= dt
-
         # Update segment render positions (spring physics)
-        snap_active = self.snap_timer > 0
-        freeze_active = self.freeze_timer > 0
+        snap_active = self.snap.running
+        freeze_active = self.freeze.running or not self.springs
         
         # Calculate stable head direction (frame-to-frame delta)
         hx = self.head_x
@@ -571,6 +642,30 @@ class BoneSnake:
     def get_segments(self):
         return self.segments
 
+    def stop_timers(self):
+        """Stop every timer the snake and its pool own, so a discarded snake leaves nothing due on the wheel."""
+        self.snap.stop()
+        self.freeze.stop()
+        for seg in self.segments + self.pool.free_segments:
+            seg.hit.stop()
+        for group in self.groups + self.pool.free_groups + [seg.group for seg in self.segments]:
+            if group is not None:
+                group.flash.stop()
+        if self.current_group is not None:
+            self.current_group.flash.stop()
+
+    def set_images(self, image, head_image):
+        """Swap the sprites of the snake, its pool and every segment; None draws the fallback circles."""
+        self.image = image
+        self.head_image = head_image
+        self.pool.image = image
+        for seg in self.segments:
+            seg.image = image
+            if seg.is_head:
+                seg.head_image = head_image
+        for seg in self.pool.free_segments:
+            seg.image = image
+
 class EntityManager:
     def __init__(self, screen_width, screen_height, image=None, head_image=None):
         self.snake = BoneSnake(screen_width, screen_height, image, head_image)
@@ -1,121 +1,192 @@
 """
 Chainfall - Entity Module (Following segment logic)
+
+A chain of modules is stored flat: one array per field, link i following
+link i - 1 (link 0 follows the anchor). Updating and drawing are single
+loops over the arrays, so chain length is bounded by memory, not by the
+recursion limit. EntityModule is a small view of one link, for combat.
 """
 import pygame
 import math
+from array import array
+import shapes
+import view
 
-class EntityModule:
-    def __init__(self, parent, distance=40, integrity=50, image=None):
-        self.parent = parent  # Can be EntityCore or another EntityModule
-        self.distance = distance
-        self.image = image
 
-        # Position - start behind parent
-        parent_pos = parent.get_position()
-        self.x = parent_pos[0]
-        self.y = parent_pos[1] + distance
+class ModuleChain:
+    radius = 18
 
-        # History for smooth following
-        self.position_history = [(self.x, self.y)] * 10
+    # Visual
+    color = (255, 120, 80)
+    glow_color = (200, 80, 40)
+    line_color = (80, 80, 80)
 
-        # Size
-        self.radius = 18
+    def __init__(self, anchor, count=0, distance=40, integrity=50, image=None):
+        self.anchor = anchor  # Anything with get_position(), e.g. an EntityCore
+        self.image = image
 
-        # Stats
-        self.max_integrity = integrity
-        self.integrity = self.max_integrity
-        self.active = True
+        self.xs = array('d')
+        self.ys = array('d')
+        self.distances = array('d')
+        self.integrity = array('i')
+        self.max_integrity = array('i')
+        self.active = array('b')
 
-        # Visual
-        self.color = (255, 120, 80)
-        self.glow_color = (200, 80, 40)
+        # Links past the first destroyed one are cut off: not updated, drawn or hittable
+        self.cut = 0
+        self._views = []
 
-        # Child module (for chaining)
-        self.child = None
+        for _ in range(count):
+            self.append(distance, integrity)
 
-    def update(self, dt):
-        if not self.active:
-            return
-
-        # Get parent position
-        parent_pos = self.parent.get_position()
-
-        # Calculate direction to parent
-        dx = parent_pos[0] - self.x
-        dy = parent_pos[1] - self.y
-        dist = math.sqrt(dx * dx + dy * dy)
-
-        if dist > 0:
-            # Normalize direction
-            dx /= dist
-            dy /= dist
-
-            # Move to maintain fixed distance from parent
-            if dist > self.distance:
-                # Too far - move closer
-                move_dist = (dist - self.distance) * 8 * dt
-                self.x += dx * move_dist
-                self.y += dy * move_dist
-            elif dist < self.distance * 0.8:
-                # Too close - push away
-                move_dist = (self.distance - dist) * 5 * dt
-                self.x -= dx * move_dist
-                self.y -= dy * move_dist
-
-        # Update child if exists
-        if self.child:
-            self.child.update(dt)
+    def __len__(self):
+        return len(self.xs)
 
-    def take_damage(self, amount):
-        self.integrity -= amount
-        if self.integrity <= 0:
-            self.active = False
+    def append(self, distance=40, integrity=50):
+        """Add a link behind the last one."""
+        if self.xs:
+            px, py = self.xs[-1], self.ys[-1]
+        else:
+            px, py = self.anchor.get_position()
+        self.xs.append(px)
+        self.ys.append(py + distance)
+        self.distances.append(distance)
+        self.integrity.append(integrity)
+        self.max_integrity.append(integrity)
+        self.active.append(1)
+        if self.cut == len(self.xs) - 1:
+            self.cut += 1
+        self._views.append(EntityModule(self, len(self._views)))
+
+    def update(self, dt):
+        xs = self.xs
+        ys = self.ys
+        distances = self.distances
+        px, py = self.anchor.get_position()
+
+        for i in range(self.cut):
+            x = xs[i]
+            y = ys[i]
+
+            # Calculate direction to parent
+            dx = px - x
+            dy = py - y
+            dist = math.sqrt(dx * dx + dy * dy)
+
+            if dist > 0:
+                # Normalize direction
+                dx /= dist
+                dy /= dist
+
+                # Move to maintain fixed distance from parent
+                distance = distances[i]
+                if dist > distance:
+                    # Too far - move closer
+                    move_dist = (dist - distance) * 8 * dt
+                    x += dx * move_dist
+                    y += dy * move_dist
+                elif dist < distance * 0.8:
+                    # Too close - push away
+                    move_dist = (distance - dist) * 5 * dt
+                    x -= dx * move_dist
+                    y -= dy * move_dist
+                xs[i] = x
+                ys[i] = y
+
+            px, py = x, y
+
+    def take_damage(self, index, amount):
+        self.integrity[index] -= amount
+        if self.integrity[index] <= 0:
+            self.active[index] = 0
+            self.cut = min(self.cut, index)
             return True  # Destroyed
         return False
 
     def draw(self, screen):
-        if not self.active:
-            return
-
-        # Draw connection line to parent
-        parent_pos = self.parent.get_position()
-        pygame.draw.line(screen, (80, 80, 80),
-                        (int(parent_pos[0]), int(parent_pos[1])),
-                        (int(self.x), int(self.y)), 3)
-
-        if self.image:
-             # Draw sprite centered
-             rect = self.image.get_rect(center=(int(self.x), int(self.y)))
-             screen.blit(self.image, rect)
-        else:
-            # Draw glow
-            pygame.draw.circle(screen, self.glow_color, (int(self.x), int(self.y)), self.radius + 4)
-            # Draw module
-            pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
+        s = view.scale
+        radius = self.radius
+        image = self.image
+        if not image:
+            shape, dx, dy = shapes.glow_circle(self.glow_color, int((radius + 4) * s), self.color, int(radius * s))
+        line_width = max(1, round(3 * s))
+        px, py = self.anchor.get_position()
+
+        for i in range(self.cut):
+            x = int(self.xs[i] * s)
+            y = int(self.ys[i] * s)
+
+            # Draw connection line to parent
+            pygame.draw.line(screen, self.line_color, (int(px * s), int(py * s)), (x, y), line_width)
+
+            if image:
+                # Draw sprite centered
+                rect = image.get_rect(center=(x, y))
+                screen.blit(image, rect)
+            else:
+                # Glow and module, pre-rendered
+                screen.blit(shape, (x + dx, y + dy))
+
+            # Draw integrity bar
+            bar_width = radius * 2 * s
+            bar_height = 4 * s
+            bar_x = self.xs[i] * s - bar_width / 2
+            bar_y = (self.ys[i] - radius - 10) * s
+
+            pygame.draw.rect(screen, (60, 60, 60), (bar_x, bar_y, bar_width, bar_height))
+            fill_width = (self.integrity[i] / self.max_integrity[i]) * bar_width
+            pygame.draw.rect(screen, (100, 255, 100), (bar_x, bar_y, fill_width, bar_height))
+
+            px, py = self.xs[i], self.ys[i]
+
+    def modules(self):
+        """The live links, head to tail, as EntityModule views (O(n), no recursion)."""
+        return self._views[:self.cut]
 
-        # Draw integrity bar
-        bar_width = self.radius * 2
-        bar_height = 4
-        bar_x = self.x - bar_width / 2
-        bar_y = self.y - self.radius - 10
 
-        pygame.draw.rect(screen, (60, 60, 60), (bar_x, bar_y, bar_width, bar_height))
-        fill_width = (self.integrity / self.max_integrity) * bar_width
-        pygame.draw.rect(screen, (100, 255, 100), (bar_x, bar_y, fill_width, bar_height))
+class EntityModule:
+    """One link of a ModuleChain. Reads and writes go straight to the chain's arrays."""
+    __slots__ = ('chain', 'index')
+
+    radius = ModuleChain.radius
+
+    def __init__(self, chain, index):
+        self.chain = chain
+        self.index = index
+
+    @property
+    def x(self):
+        return self.chain.xs[self.index]
+
+    @x.setter
+    def x(self, value):
+        self.chain.xs[self.index] = value
 
-        # Draw child
-        if self.child:
-            self.child.draw(screen)
+    @property
+    def y(self):
+        return self.chain.ys[self.index]
+
+    @y.setter
+    def y(self, value):
+        self.chain.ys[self.index] = value
+
+    @property
+    def active(self):
+        return bool(self.chain.active[self.index])
+
+    @property
+    def integrity(self):
+        return self.chain.integrity[self.index]
+
+    def take_damage(self, amount):
+        return self.chain.take_damage(self.index, amount)
 
     def get_position(self):
-        return (self.x, self.y)
+        return (self.chain.xs[self.index], self.chain.ys[self.index])
 
     def get_radius(self):
         return self.radius
 
     def get_all_modules(self):
-        """Get this module and all children as a flat list"""
-        modules = [self]
-        if self.child and self.child.active:
-            modules.extend(self.child.get_all_modules())
-        return modules
+        """This module and the live modules behind it"""
+        return self.chain.modules()[self.index:]
@@ -0,0 +1,340 @@
+"""
+Chainfall - Game loop core and frame pacing
+
+GameLoop owns the window, the World and the debug tools, and does one
+loop iteration per frame(). The desktop and browser entry points only
+differ in how they wait for the next deadline:
+
+    main_async.py   time.sleep           (desktop)
+    main.py         await asyncio.sleep  (pygbag)
+"""
+import time
+from array import array
+import pygame
+import rng
+import telemetry
+import view
+from world import World
+from profiler import FrameProfiler
+from gc_control import GCController
+from governor import LoadGovernor, apply_level
+from config import SCREEN_WIDTH, SCREEN_HEIGHT, FPS, BG_COLOR
+from config import PROFILER_ENABLED, PROFILER_HISTORY, REPLAY_RECORD, RNG_SEED, SNAPSHOT_PATH
+from config import PACING_MAX_STEPS, PACING_REPORT_INTERVAL, LOW_LATENCY_INPUT, LOW_LATENCY_MARGIN_MS, DISPLAY_VSYNC
+from config import GC_CONTROL_ENABLED, GC_THRESHOLDS, GC_SLACK_MS, GC_QUIET_INTERVAL
+from config import PARALLEL_UPDATE, PARALLEL_WORKERS
+from config import GOVERNOR_ENABLED, GOVERNOR_BUDGET_MS, GOVERNOR_WINDOW, GOVERNOR_RESTORE_RATIO, GOVERNOR_RESTORE_WINDOWS
+from config import MEMTRACK_ENABLED, MEMTRACK_INTERVAL, MEMTRACK_LOG, MEMTRACK_TOP
+from config import SPIKE_CAPTURE_ENABLED, SPIKE_BUDGET_MS, SPIKE_CAPTURE_MODE, SPIKE_CAPTURE_FRAMES, SPIKE_CAPTURE_DIR, SPIKE_MAX_CAPTURES
+
+
+class FramePacer:
+    """
+    Fixed-rate frame deadlines. The simulation always advances in steps of
+    1/fps; when a frame starts late, the steps it owes are run back to back
+    and only one frame is rendered, so render frames are dropped first.
+    Past max_steps the remaining simulation time is dropped as well.
+
+    lead moves each wake-up that far ahead of its deadline, so the work
+    of a frame ends at the deadline instead of starting there.
+    """
+    def __init__(self, fps, max_steps=5, clock=time.perf_counter):
+        self.step = 1.0 / fps
+        self.max_steps = max_steps
+        self.clock = clock
+        self.deadline = None
+        self.lead = 0.0
+
+        self.missed = 0          # Deadlines that passed without a rendered frame
+        self.dropped_steps = 0   # Simulation steps thrown away after falling too far behind
+        self.frames = 0
+
+    def reset(self):
+        """Start pacing afresh from now, e.g. after the window was hidden."""
+        self.deadline = None
+
+    def delay(self):
+        """Seconds to wait before the next frame is due (0 if it already is)."""
+        if self.deadline is None:
+            self.deadline = self.clock()
+        return max(0.0, self.deadline - self.lead - self.clock())
+
+    def due(self):
+        """Simulation steps owed now. 0 means the wait ended early; wait again."""
+        now = self.clock()
+        if self.deadline is None:
+            self.deadline = now
+        start = self.deadline - self.lead
+        if now < start:
+            return 0
+
+        steps = int((now - start) / self.step) + 1
+        if steps > self.max_steps:
+            self.dropped_steps += steps - self.max_steps
+            steps = self.max_steps
+            self.deadline = now + self.step
+        else:
+            self.deadline += steps * self.step
+        self.missed += steps - 1
+        self.frames += 1
+        return steps
+
+    def counts(self):
+        return {'missed_frames': self.missed, 'dropped_steps': self.dropped_steps}
+
+
+class LatencyMeter:
+    """Input-to-present latency: from sampling events and keys to display.flip() returning."""
+    def __init__(self, capacity=120):
+        self.capacity = capacity
+        self.samples = array('d', [0.0]) * capacity
+        self.count = 0
+        self.sampled_at = None
+
+    def input_sampled(self):
+        self.sampled_at = time.perf_counter()
+
+    def presented(self):
+        if self.sampled_at is None:
+            return
+        self.samples[self.count % self.capacity] = (time.perf_counter() - self.sampled_at) * 1000.0
+        self.count += 1
+        self.sampled_at = None
+
+    def recent(self):
+        return sorted(self.samples[:min(self.count, self.capacity)])
+
+    def percentile(self, fraction):
+        values = self.recent()
+        return values[int((len(values) - 1) * fraction)] if values else 0.0
+
+    def counts(self):
+        return {'input_lag_ms': round(self.percentile(0.5), 2)}
+
+    def summary(self):
+        return (f"input-to-present p50 {self.percentile(0.5):.2f}ms, "
+                f"p95 {self.percentile(0.95):.2f}ms, max {self.percentile(1.0):.2f}ms")
+
+
+class GameLoop:
+    """Everything both entry points share. Call frame() once per wake-up until running is False."""
+    def __init__(self, loader, quit_on_escape=True):
+        # Only what the game uses: pygame.init() would also start audio, joystick and the rest
+        pygame.display.init()
+        pygame.font.init()
+        self.screen = self._open_display()
+        pygame.display.set_caption("Chainfall")
+
+        self.loader = loader
+        self.quit_on_escape = quit_on_escape
+        self.pacer = FramePacer(FPS, PACING_MAX_STEPS)
+        self.latency = LatencyMeter()
+        self.low_latency = LOW_LATENCY_INPUT
+        self._recent_work = []
+        self.profiler = FrameProfiler(PROFILER_HISTORY, PROFILER_ENABLED)
+        # Debug tools are only loaded once their config flag or hotkey asks for them
+        self.spikes = self._spike_capture(True) if SPIKE_CAPTURE_ENABLED else None
+        self.memtrack = self._memory_tracker(True) if MEMTRACK_ENABLED else None
+        self.gc = GCController(GC_THRESHOLDS, GC_SLACK_MS, GC_QUIET_INTERVAL, enabled=GC_CONTROL_ENABLED)
+        self.gc.start()
+        self.gc.freeze()
+        self.governor = LoadGovernor(GOVERNOR_BUDGET_MS, GOVERNOR_WINDOW, GOVERNOR_RESTORE_RATIO,
+                                     GOVERNOR_RESTORE_WINDOWS, GOVERNOR_ENABLED)
+
+        self.scheduler = None  # World updates sequentially without one
+        if PARALLEL_UPDATE:
+            from parallel import Scheduler
+            self.scheduler = Scheduler(PARALLEL_WORKERS, enabled=True)
+
+        seed = rng.seed(RNG_SEED)
+        self.world = World(SCREEN_WIDTH, SCREEN_HEIGHT, loader.assets, self.profiler, self.scheduler)
+        self.recorder = None
+        if REPLAY_RECORD:
+            import replay
+            self.recorder = replay.Recorder(replay.default_path(), seed, FPS)
+
+        self.running = True
+        self.suspended = False
+        self._failed_assets = 0
+        self._reported_missed = 0
+        self._next_report = time.perf_counter() + PACING_REPORT_INTERVAL
+
+    def _spike_capture(self, enabled):
+        from profiler import SpikeCapture
+        return SpikeCapture(SPIKE_BUDGET_MS, SPIKE_CAPTURE_MODE, SPIKE_CAPTURE_FRAMES,
+                            SPIKE_CAPTURE_DIR, SPIKE_MAX_CAPTURES, enabled)
+
+    def _memory_tracker(self, enabled):
+        from memtrack import MemoryTracker
+        return MemoryTracker(MEMTRACK_INTERVAL, MEMTRACK_LOG, MEMTRACK_TOP, enabled)
+
+    def _open_display(self):
+        # Below full resolution the game draws into a smaller screen and SDL scales it up when presenting
+        size = view.screen_size()
+        flags = pygame.SCALED if view.scale != 1 else 0
+        if DISPLAY_VSYNC:
+            try:
+                return pygame.display.set_mode(size, flags, vsync=1)
+            except pygame.error as e:
+                error = e
+            # Older pygame only vsyncs through a renderer; at scale 1 SCALED is one the size of the window
+            if not flags & pygame.SCALED:
+                try:
+                    return pygame.display.set_mode(size, flags | pygame.SCALED, vsync=1)
+                except pygame.error as e:
+                    error = e
+            print(f"VSync unavailable, continuing without: {error}")
+        return pygame.display.set_mode(size, flags)
+
+    def delay(self):
+        return self.pacer.delay()
+
+    def frame(self):
+        steps = self.pacer.due()
+        if steps == 0:
+            return
+        started = time.perf_counter()
+        profiler = self.profiler
+        spikes = self.spikes
+        recorder = self.recorder
+        world = self.world
+        dt = self.pacer.step
+
+        profiler.begin_frame()
+        if spikes:
+            spikes.begin_frame()
+        self.loader.poll()
+        if len(self.loader.failed) != self._failed_assets:
+            self._failed_assets = len(self.loader.failed)
+            world.refresh_assets()
+
+        # Event handling, as close to the update as possible
+        events = pygame.event.get()
+        keys = pygame.key.get_pressed()
+        self.latency.input_sampled()
+        for event in events:
+            self.handle_event(event)
+        # Presses the world took while suspended go out with the next recorded tick
+        if recorder:
+            recorder.press(events)
+        profiler.lap('events')
+
+        if self.suspended:
+            if spikes:
+                spikes.cancel_frame()
+            return
+
+        # Catch up on every step owed, then render once
+        level = self.governor.level
+        apply_level(world, level)
+        for _ in range(steps):
+            world.update(dt, keys)
+            if recorder:
+                recorder.record_step(dt, keys, level, world)
+
+        # Render
+        world.draw(self.screen, BG_COLOR)
+        self.loader.draw_progress(self.screen)
+        profiler.lap('hud.draw')
+        profiler.draw(self.screen)
+
+        pygame.display.flip()
+        self.latency.presented()
+        profiler.lap('present')
+        work = time.perf_counter() - started
+        self.governor.record(work * 1000.0)
+        if work > dt:
+            telemetry.log(telemetry.BUDGET_OVERRUN, work * 1000.0)
+        if self.low_latency:
+            self._update_lead(work)
+        if profiler.enabled:
+            profiler.end_frame(self.counts())
+        if spikes and spikes.enabled:
+            spikes.end_frame(self.counts)
+        if self.memtrack:
+            self.memtrack.update(dt * steps, world)
+        self.report_missed()
+
+        # Spend spare time on the collector instead of letting it interrupt a frame
+        self.gc.idle(self.pacer.delay(), world.game_over or world.progression_manager.upgrade_active)
+        if world.game_over:
+            telemetry.flush()  # Nothing is being played, so the write costs the player nothing
+
+    def _update_lead(self, work):
+        # Wake early by the recent worst case of work, plus a margin for sleep overshoot
+        recent = self._recent_work
+        recent.append(work)
+        if len(recent) > 30:
+            del recent[0]
+        self.pacer.lead = min(max(recent) + LOW_LATENCY_MARGIN_MS / 1000.0, self.pacer.step * 0.9)
+
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            self.running = False
+        elif event.type in (pygame.WINDOWHIDDEN, pygame.WINDOWMINIMIZED):
+            # Suspend: freeze the simulation rather than catching up on return
+            self.suspended = True
+            telemetry.flush()
+        elif event.type in (pygame.WINDOWSHOWN, pygame.WINDOWRESTORED):
+            if self.suspended:
+                self.suspended = False
+                self.pacer.reset()
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE and self.quit_on_escape:
+                self.running = False
+            elif event.key == pygame.K_F3:
+                self.profiler.toggle_overlay()
+            elif event.key == pygame.K_F4:
+                self.profiler.export_csv()
+            elif event.key == pygame.K_F5:
+                if self.spikes is None:
+                    self.spikes = self._spike_capture(False)
+                self.spikes.toggle()
+            elif event.key == pygame.K_F6:
+                if self.memtrack is None:
+                    self.memtrack = self._memory_tracker(False)
+                self.memtrack.toggle()
+            elif event.key == pygame.K_F7:
+                import snapshot  # Debug keys only; not worth loading at startup
+                snapshot.save(self.world, SNAPSHOT_PATH)
+            elif event.key == pygame.K_F8:
+                if self.recorder:
+                    print("Snapshot load is disabled while recording a replay; playback could not follow it")
+                else:
+                    import snapshot
+                    snapshot.load(self.world, SNAPSHOT_PATH)
+        self.world.handle_event(event)
+
+    def report_missed(self):
+        now = time.perf_counter()
+        if now < self._next_report:
+            return
+        self._next_report = now + PACING_REPORT_INTERVAL
+        missed = self.pacer.missed - self._reported_missed
+        if missed:
+            self._reported_missed = self.pacer.missed
+            print(f"Frame pacing: {missed} missed deadline(s) in the last {PACING_REPORT_INTERVAL:.0f}s "
+                  f"({self.pacer.dropped_steps} simulation steps dropped in total)")
+        if self.low_latency:
+            print(f"Latency: {self.latency.summary()}, wake lead {self.pacer.lead * 1000.0:.1f}ms")
+
+    def counts(self):
+        counts = self.world.counts()
+        counts.update(self.pacer.counts())
+        counts.update(self.gc.counts())
+        counts.update(self.governor.counts())
+        counts.update(self.latency.counts())
+        return counts
+
+    def close(self):
+        if self.recorder:
+            self.recorder.close()
+        telemetry.flush()
+        print(f"Frames: {self.pacer.frames}, missed deadlines: {self.pacer.missed}, "
+              f"dropped simulation steps: {self.pacer.dropped_steps}")
+        print(f"Latency: {self.latency.summary()}")
+        self.gc.report()
+        self.gc.stop()
+        if self.scheduler:
+            self.scheduler.close()
+        pygame.quit()
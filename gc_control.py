@@ -0,0 +1,120 @@
+"""
+Chainfall - Garbage collector scheduling
+
+Automatic collections run whenever enough allocations pile up, which
+means mid-frame, at random. GCController moves them to where they are
+cheap: everything alive before the World is built is frozen out of the
+collector, the automatic thresholds are raised while playing, and
+young generations are collected in frames that finish with time to
+spare. Full collections run only on the upgrade screen and at game over.
+Every pause is timed via gc.callbacks.
+"""
+import gc
+import time
+from array import array
+
+
+class GCController:
+    def __init__(self, thresholds=(10000, 50, 100), slack_ms=4.0, quiet_interval=5.0, history=256, enabled=True):
+        self.thresholds = thresholds
+        self.slack = slack_ms / 1000.0
+        self.quiet_interval = quiet_interval
+        self.enabled = enabled
+
+        self.frozen = False
+        self.history = history
+        self.pauses = array('d', [0.0]) * history     # ms, ring buffer of the latest pauses
+        self.count = 0
+        self.max_ms = [0.0, 0.0, 0.0]                 # Worst pause per generation
+        self.unscheduled = 0                          # Automatic collections (the mid-frame kind)
+        self._default_thresholds = gc.get_threshold()
+        self._started = None
+        self._explicit = False
+        self._last_full = 0.0
+
+    def start(self):
+        if not self.enabled:
+            return
+        gc.callbacks.append(self._callback)
+        gc.set_threshold(*self.thresholds)
+
+    def stop(self):
+        if self._callback in gc.callbacks:
+            gc.callbacks.remove(self._callback)
+        gc.set_threshold(*self._default_thresholds)
+        self.unfreeze()
+
+    def freeze(self):
+        """
+        Collect once, then move everything alive (modules, fonts, the display)
+        out of the collector's reach. Call it before building the World: a
+        frozen cycle is never collected, and the game drops snakes and players.
+        """
+        if not self.enabled or self.frozen:
+            return
+        self.collect(2)
+        gc.freeze()
+        self.frozen = True
+
+    def unfreeze(self):
+        """Hand frozen objects back to the collector (gc.get_objects() does not see them while frozen)."""
+        if self.frozen:
+            gc.unfreeze()
+            self.frozen = False
+
+    def collect(self, generation):
+        self._explicit = True
+        try:
+            gc.collect(generation)
+        finally:
+            self._explicit = False
+
+    def idle(self, slack, quiet=False):
+        """
+        Call once per frame after presenting, with the time left until the next
+        deadline. quiet is True when nothing is moving (upgrade screen, game over).
+        """
+        if not self.enabled:
+            return
+        if quiet:
+            now = time.perf_counter()
+            if now - self._last_full >= self.quiet_interval:
+                self._last_full = now
+                self.collect(2)
+            return
+        if slack < self.slack:
+            return
+        # Collect the young generations before the automatic thresholds are reached
+        young, middle, _ = gc.get_count()
+        if middle >= self.thresholds[1] // 2:
+            self.collect(1)
+        elif young >= self.thresholds[0] // 4:
+            self.collect(0)
+
+    def _callback(self, phase, info):
+        if phase == "start":
+            self._started = time.perf_counter()
+            return
+        if self._started is None:
+            return
+        elapsed_ms = (time.perf_counter() - self._started) * 1000.0
+        self._started = None
+        self.pauses[self.count % self.history] = elapsed_ms
+        self.count += 1
+        generation = info["generation"]
+        if elapsed_ms > self.max_ms[generation]:
+            self.max_ms[generation] = elapsed_ms
+        if not self._explicit:
+            self.unscheduled += 1
+
+    def recent_max(self):
+        filled = min(self.count, self.history)
+        return max(self.pauses[:filled]) if filled else 0.0
+
+    def counts(self):
+        return {'gc_pauses': self.count, 'gc_unscheduled': self.unscheduled,
+                'gc_recent_max_ms': round(self.recent_max(), 2)}
+
+    def report(self):
+        worst = ", ".join(f"gen{i} {ms:.2f}ms" for i, ms in enumerate(self.max_ms))
+        print(f"GC: {self.count} collections ({self.unscheduled} unscheduled), worst pause {worst}")
@@ -0,0 +1,75 @@
+"""
+Chainfall - Frame-budget load governor
+
+Watches the average work per frame and, when it runs over budget, sheds
+load one level at a time instead of letting the game slow down. Levels
+are cumulative, cheapest-to-lose first:
+
+    1  cap live damage numbers
+    2  spring smoothing off (segments render on the path)
+    3  wider orb merging, applied to live orbs every step (XP is kept)
+    4  cap snake segment spawning
+
+Levels 3 and 4 change the simulation, so replays record the level per tick.
+"""
+from array import array
+from config import (ORB_MERGE_RADIUS, SNAKE_MAX_SEGMENTS, GOVERNOR_MAX_DAMAGE_NUMBERS, GOVERNOR_ORB_MERGE_RADIUS,
+                    GOVERNOR_MAX_SEGMENTS)
+
+MAX_LEVEL = 4
+
+
+def apply_level(world, level):
+    """Set every manager's knobs for `level`. Cheap; called before each step."""
+    snake = world.entity_manager.snake
+    world.combat_manager.max_damage_numbers = GOVERNOR_MAX_DAMAGE_NUMBERS if level >= 1 else None
+    snake.springs = level < 2
+    progression = world.progression_manager
+    progression.merge_radius = GOVERNOR_ORB_MERGE_RADIUS if level >= 3 else ORB_MERGE_RADIUS
+    progression.merge_pass = level >= 3
+    snake.max_segments = GOVERNOR_MAX_SEGMENTS if level >= 4 else SNAKE_MAX_SEGMENTS
+
+
+class LoadGovernor:
+    def __init__(self, budget_ms, window=30, restore_ratio=0.6, restore_windows=4, enabled=True):
+        self.budget_ms = budget_ms
+        self.window = window
+        self.restore_ratio = restore_ratio
+        self.restore_windows = restore_windows
+        self.enabled = enabled
+
+        self.level = 0
+        self.changes = 0
+        self.samples = array('d', [0.0]) * window
+        self._count = 0
+        self._calm = 0  # Consecutive windows with headroom
+
+    def record(self, work_ms):
+        """Feed one frame's work time; re-decides the level once per window."""
+        if not self.enabled:
+            return
+        self.samples[self._count % self.window] = work_ms
+        self._count += 1
+        if self._count % self.window:
+            return
+
+        mean = sum(self.samples) / self.window
+        if mean > self.budget_ms:
+            self._calm = 0
+            if self.level < MAX_LEVEL:
+                self._set(self.level + 1, mean)
+        elif mean < self.budget_ms * self.restore_ratio:
+            self._calm += 1
+            if self._calm >= self.restore_windows and self.level > 0:
+                self._calm = 0
+                self._set(self.level - 1, mean)
+        else:
+            self._calm = 0
+
+    def _set(self, level, mean):
+        print(f"Load governor: level {self.level} -> {level} (mean frame work {mean:.1f}ms, budget {self.budget_ms:.1f}ms)")
+        self.level = level
+        self.changes += 1
+
+    def counts(self):
+        return {'load_level': self.level}
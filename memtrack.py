@@ -0,0 +1,151 @@
+"""
+Chainfall - Memory tracking (tracemalloc growth, live object counts)
+"""
+import gc
+import os
+from entity_core import SnakeSegment, SegmentGroup
+from projectile import Projectile
+
+TRACKED_TYPES = (SnakeSegment, SegmentGroup, Projectile)
+
+
+def _trace_filters():
+    """Allocations made by the tracker itself are noise in the growth report."""
+    import tracemalloc
+    return (
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        tracemalloc.Filter(False, "<unknown>"),
+    )
+
+
+def count_live_objects(types=TRACKED_TYPES):
+    """Count live instances by walking the GC. Too slow for every frame, fine per interval."""
+    counts = dict.fromkeys((t.__name__ for t in types), 0)
+    wanted = {t: t.__name__ for t in types}
+    for obj in gc.get_objects():
+        name = wanted.get(type(obj))
+        if name is not None:
+            counts[name] += 1
+    return counts
+
+
+def sample_counts(world):
+    """Live object counts, the snake's path_history length, and live orbs and effects (held in arrays, not objects)."""
+    counts = count_live_objects()
+    counts['path_history'] = len(world.entity_manager.snake.path_history)
+    counts['orbs'] = len(world.progression_manager.orbs)
+    counts['effects'] = len(world.combat_manager.effects)
+    return counts
+
+
+class MemoryTracker:
+    """
+    Every `interval` seconds of game time: take a tracemalloc snapshot, print
+    the top growth by file:line against the previous snapshot, and append
+    traced memory, live object, orb and effect counts and path_history length to a CSV log.
+    """
+    def __init__(self, interval=10.0, log_path="memtrack.csv", top=10, enabled=False):
+        self.enabled = False
+        self.interval = interval
+        self.log_path = log_path
+        self.top = top
+        self.elapsed = 0.0
+        self.history = []  # One dict per sample
+
+        self._timer = 0.0
+        self._snapshot = None
+        self._writer = None
+        self._log_file = None
+        self._started_tracing = False  # Whether start() began tracemalloc, so stop() ends only its own tracing
+
+        if enabled:
+            self.start()
+
+    def start(self):
+        if self.enabled:
+            return
+        self.enabled = True
+        import tracemalloc  # Only once tracking is switched on
+        self._started_tracing = not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+        self._snapshot = self._take_snapshot()
+        self._timer = 0.0
+        print(f"Memory tracking on (every {self.interval:.0f}s, log {self.log_path})")
+
+    def stop(self):
+        if not self.enabled:
+            return
+        self.enabled = False
+        self._snapshot = None
+        if self._started_tracing:
+            import tracemalloc
+            tracemalloc.stop()
+            self._started_tracing = False
+        if self._log_file:
+            self._log_file.close()
+            self._log_file = None
+            self._writer = None
+        print("Memory tracking off")
+
+    def toggle(self):
+        if self.enabled:
+            self.stop()
+        else:
+            self.start()
+
+    def update(self, dt, world):
+        if not self.enabled:
+            return
+        self.elapsed += dt
+        self._timer += dt
+        if self._timer >= self.interval:
+            self._timer = 0.0
+            self.sample(world)
+
+    def _take_snapshot(self):
+        import tracemalloc
+        return tracemalloc.take_snapshot().filter_traces(_trace_filters())
+
+    def sample(self, world):
+        snapshot = self._take_snapshot()
+        if self._snapshot is not None:
+            self._report_growth(snapshot.compare_to(self._snapshot, 'lineno'))
+        self._snapshot = snapshot
+
+        import tracemalloc
+        current, peak = tracemalloc.get_traced_memory()
+        row = {
+            'time': round(self.elapsed, 2),
+            'traced_kib': current // 1024,
+            'peak_kib': peak // 1024,
+        }
+        row.update(sample_counts(world))
+        self.history.append(row)
+        self._log(row)
+        return row
+
+    def _report_growth(self, diffs):
+        growth = [d for d in diffs if d.size_diff > 0][:self.top]
+        if not growth:
+            return
+        print(f"Memory growth at t={self.elapsed:.0f}s:")
+        for d in growth:
+            frame = d.traceback[0]
+            print(f"  {os.path.basename(frame.filename)}:{frame.lineno}  "
+                  f"+{d.size_diff / 1024:.1f} KiB ({d.count_diff:+d} blocks, {d.size / 1024:.1f} KiB total)")
+
+    def _log(self, row):
+        if self.log_path is None:
+            return
+        if self._writer is None:
+            import csv
+            new_file = not os.path.exists(self.log_path)
+            self._log_file = open(self.log_path, 'a', newline='')
+            self._writer = csv.DictWriter(self._log_file, fieldnames=list(row))
+            if new_file:
+                self._writer.writeheader()
+        self._writer.writerow(row)
+        self._log_file.flush()
@@ -0,0 +1,172 @@
+"""
+Chainfall - Parallel subsystem update (free-threaded CPython)
+
+World.update is a list of Tasks in the sequential order, each naming the
+state it reads and writes. plan() puts every task one level after the
+last earlier task it conflicts with (a write on either side of a shared
+name), so tasks on one level touch disjoint state and running a level
+concurrently gives the same result as running the list in order.
+
+Under the GIL threads only add overhead, so Scheduler runs the list in
+order unless the interpreter is free-threaded with the GIL off.
+check_determinism() runs one seeded session both ways and compares the
+snapshots:
+
+    python parallel.py                  # determinism check and timings
+    python parallel.py --steps 3000
+"""
+import sys
+import time
+import rng
+
+
+def free_threaded():
+    """True on a free-threaded build running with the GIL disabled."""
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+class Task:
+    """fn(dt, keys), with the names of the state it reads and writes. lap: profiler section ended by this task."""
+    __slots__ = ('name', 'fn', 'reads', 'writes', 'lap')
+
+    def __init__(self, name, fn, reads=(), writes=(), lap=None):
+        self.name = name
+        self.fn = fn
+        self.reads = frozenset(reads)
+        self.writes = frozenset(writes)
+        self.lap = lap
+
+    def conflicts(self, other):
+        return bool(self.writes & (other.reads | other.writes) or other.writes & self.reads)
+
+
+def plan(tasks):
+    """tasks grouped into levels that run one after another; a level's tasks can run at the same time."""
+    levels = []
+    placed = []  # (task, level) for every task so far
+    for task in tasks:
+        level = 0
+        for earlier, earlier_level in placed:
+            if earlier_level >= level and task.conflicts(earlier):
+                level = earlier_level + 1
+        if level == len(levels):
+            levels.append([])
+        levels[level].append(task)
+        placed.append((task, level))
+    return levels
+
+
+class Step:
+    """A fixed task list and its plan, worked out once."""
+    def __init__(self, tasks):
+        self.tasks = tasks
+        self.levels = plan(tasks)
+
+
+class Scheduler:
+    """
+    Runs a Step. Sequential unless enabled on a free-threaded interpreter
+    (force skips that check, for determinism runs). In parallel, a level's
+    first task runs on the calling thread and the rest on the pool, and
+    each level's profiler laps are taken after the whole level: its time
+    is booked to the first of them.
+    """
+    def __init__(self, workers=4, enabled=False, force=False):
+        self.workers = workers
+        self.parallel = enabled and (force or free_threaded())
+        self._executor = None
+        if enabled and not self.parallel:
+            print("Parallel update needs free-threaded Python with the GIL off; updating sequentially")
+
+    def run(self, step, dt, keys, profiler):
+        if not self.parallel:
+            for task in step.tasks:
+                task.fn(dt, keys)
+                if task.lap:
+                    profiler.lap(task.lap)
+            return
+
+        for level in step.levels:
+            if len(level) > 1:
+                if self._executor is None:
+                    from concurrent.futures import ThreadPoolExecutor
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="update")
+                futures = [self._executor.submit(task.fn, dt, keys) for task in level[1:]]
+                level[0].fn(dt, keys)
+                for future in futures:
+                    future.result()
+            else:
+                level[0].fn(dt, keys)
+            for task in level:
+                if task.lap:
+                    profiler.lap(task.lap)
+
+    def close(self):
+        if self._executor:
+            self._executor.shutdown()
+            self._executor = None
+
+
+def _session(scheduler, steps, seed):
+    """
+    A scripted, seeded session: strafe back and forth, confirm any upgrade,
+    and drop an orb by the player twice a second so progression has work too.
+    Returns (snapshot, seconds).
+    """
+    import pygame
+    import replay
+    import snapshot
+    from world import World
+    from config import SCREEN_WIDTH, SCREEN_HEIGHT, FPS
+
+    rng.seed(seed)
+    world = World(SCREEN_WIDTH, SCREEN_HEIGHT, scheduler=scheduler)
+    keys = replay.ReplayKeys()
+    left = 1 << replay.INPUT_KEYS.index(pygame.K_LEFT)
+    right = 1 << replay.INPUT_KEYS.index(pygame.K_RIGHT)
+    confirm = replay.pressed_events([replay.INPUT_KEYS.index(pygame.K_SPACE)])
+    dt = 1.0 / FPS
+
+    started = time.perf_counter()
+    for tick in range(steps):
+        if world.progression_manager.upgrade_active:
+            for event in confirm:
+                world.handle_event(event)
+        keys.mask = left if (tick // 90) % 2 else right
+        if tick % 30 == 0:
+            world.progression_manager.spawn_orb(world.player.x, world.player.y - 40, 15)
+        world.update(dt, keys)
+    elapsed = time.perf_counter() - started
+    return snapshot.snapshot(world), elapsed
+
+
+def check_determinism(steps=1200, seed=1, workers=4):
+    """Run the same session sequentially and on the pool. Returns (match, sequential s, parallel s)."""
+    sequential = Scheduler()
+    concurrent = Scheduler(workers, enabled=True, force=True)
+    try:
+        expected, sequential_time = _session(sequential, steps, seed)
+        actual, parallel_time = _session(concurrent, steps, seed)
+    finally:
+        concurrent.close()
+    return expected == actual, sequential_time, parallel_time
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Check that the parallel update matches the sequential one")
+    parser.add_argument('--steps', type=int, default=1200)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    match, sequential_time, parallel_time = check_determinism(args.steps, args.seed, args.workers)
+    print(f"Free-threaded: {'yes' if free_threaded() else 'no (the GIL serializes the pool)'}")
+    print(f"{args.steps} steps: sequential {sequential_time * 1000:.1f} ms, parallel {parallel_time * 1000:.1f} ms")
+    print("Parallel update matches the sequential order" if match else "Parallel update DIVERGED from the sequential order")
+    return 0 if match else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
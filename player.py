@@ -2,6 +2,9 @@
 Chainfall - Player movement and firing logic
 """
 import pygame
+import shapes
+import view
+from timers import Timer
 
 class Player:
     def __init__(self, screen_width, screen_height, image=None):
@@ -11,7 +14,7 @@ class Player:
 
         # Player dimensions
         self.width = 60
-        self.height = 60 if image is None else image.get_height()
+        self.height = 60 if image is None else round(image.get_height() / view.scale)  # Sprites are pre-scaled
 
         # Position (centered horizontally, near bottom)
         self.x = screen_width / 2
@@ -23,7 +26,7 @@ class Player:
 
         # Firing
         self.fire_rate = 0.15  # seconds between shots
-        self.fire_timer = 0
+        self.fire_cooldown = Timer()
         self.rapid_fire = False
 
         # Visual
@@ -51,41 +54,38 @@ class Player:
         if self.x > self.screen_width - half_width:
             self.x = self.screen_width - half_width
 
-        # Update fire timer
-        if self.fire_timer > 0:
-            self.fire_timer -= dt
-
     def try_fire(self, projectile_manager):
-        if self.fire_timer <= 0:
+        if not self.fire_cooldown.running:
             projectile_manager.spawn(self.x, self.y - self.height / 2)
             
             # 3x speed if rapid fire is active
             delay = self.fire_rate / 3.0 if self.rapid_fire else self.fire_rate
-            self.fire_timer = delay
+            self.fire_cooldown.start(delay)
 
     def draw(self, screen):
+        s = view.scale
         if self.image:
              # Draw sprite centered
-            rect = self.image.get_rect(center=(self.x, self.y))
+            rect = self.image.get_rect(center=(self.x * s, self.y * s))
             screen.blit(self.image, rect)
         else:
             # Draw glow effect
             glow_rect = pygame.Rect(
-                self.x - self.width / 2 - 4,
-                self.y - self.height / 2 - 4,
-                self.width + 8,
-                self.height + 8
+                (self.x - self.width / 2 - 4) * s,
+                (self.y - self.height / 2 - 4) * s,
+                (self.width + 8) * s,
+                (self.height + 8) * s
             )
-            pygame.draw.rect(screen, self.glow_color, glow_rect, border_radius=6)
+            screen.blit(shapes.rounded_rect(self.glow_color, glow_rect.width, glow_rect.height, 6), glow_rect)
 
             # Draw main body
             main_rect = pygame.Rect(
-                self.x - self.width / 2,
-                self.y - self.height / 2,
-                self.width,
-                self.height
+                (self.x - self.width / 2) * s,
+                (self.y - self.height / 2) * s,
+                self.width * s,
+                self.height * s
             )
-            pygame.draw.rect(screen, self.color, main_rect, border_radius=4)
+            screen.blit(shapes.rounded_rect(self.color, main_rect.width, main_rect.height, 4), main_rect)
 
     def get_rect(self):
         return pygame.Rect(
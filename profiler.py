@@ -0,0 +1,264 @@
+"""
+Chainfall - Frame profiler (per-subsystem timings, overlay, CSV trace)
+"""
+import os
+import time
+from array import array
+import pygame
+
+
+def collect_counts(entity_manager, projectile_manager, progression_manager, combat_manager):
+    """Live entity counts shown next to the timings."""
+    snake = entity_manager.snake
+    return {
+        'segments': len(snake.segments),
+        'path_history': len(snake.path_history),
+        'projectiles': len(projectile_manager.projectiles),
+        'orbs': len(progression_manager.orbs),
+        'damage_numbers': combat_manager.effects.count(combat_manager.damage_number_id),
+        'effects': len(combat_manager.effects),
+    }
+
+
+class FrameProfiler:
+    """
+    Lap timer for the main loop. Each lap() charges the time since the
+    previous lap to the named section, so a frame is fully accounted for.
+    Timings live in fixed-size ring buffers (one slot per frame). When
+    disabled every call is a single attribute check.
+    """
+    def __init__(self, capacity=600, enabled=False):
+        self.enabled = enabled
+        self.show_overlay = False
+        self.capacity = capacity
+        self.frame = 0
+        self.samples = {}  # section -> array('d') of ms, indexed by frame % capacity
+        self.frame_ids = array('q', [-1]) * capacity
+        self.counts = {}
+
+        self._last = 0.0
+        self._slot = 0
+        self._font = None
+        self._panel = None
+        self._overlay_age = 0
+
+    def toggle_overlay(self):
+        self.show_overlay = not self.show_overlay
+        if self.show_overlay and not self.enabled:
+            # Start recording from here; the rest of this frame is partial
+            self.enabled = True
+            self.begin_frame()
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        slot = self.frame % self.capacity
+        for ring in self.samples.values():
+            ring[slot] = 0.0
+        self.frame_ids[slot] = -1  # Only end_frame() marks the slot as a finished frame
+        self._slot = slot
+        self._last = time.perf_counter()
+
+    def lap(self, name):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        ring = self.samples.get(name)
+        if ring is None:
+            ring = self.samples[name] = array('d', [0.0]) * self.capacity
+        ring[self._slot] += (now - self._last) * 1000.0
+        self._last = now
+
+    def end_frame(self, counts=None):
+        if not self.enabled:
+            return
+        if counts is not None:
+            self.counts = counts
+        self.frame_ids[self._slot] = self.frame
+        self.frame += 1
+
+    def _filled_slots(self):
+        return [i for i in range(self.capacity) if self.frame_ids[i] >= 0]
+
+    def percentiles(self):
+        """section -> (p50, p95, p99) over the ring buffer, in ms."""
+        slots = self._filled_slots()
+        if not slots:
+            return {}
+        result = {}
+        for name, ring in self.samples.items():
+            values = sorted(ring[i] for i in slots)
+            last = len(values) - 1
+            result[name] = (values[last // 2], values[int(last * 0.95)], values[int(last * 0.99)])
+        return result
+
+    def frame_totals(self):
+        slots = self._filled_slots()
+        return [sum(ring[i] for ring in self.samples.values()) for i in slots]
+
+    def export_csv(self, path=None):
+        """Write the buffered trace (one row per frame, oldest first)."""
+        if path is None:
+            path = time.strftime("profile_trace_%Y%m%d_%H%M%S.csv")
+        import csv
+        names = list(self.samples)
+        slots = sorted(self._filled_slots(), key=lambda i: self.frame_ids[i])
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['frame', 'total_ms'] + names)
+            for i in slots:
+                row = [self.samples[name][i] for name in names]
+                writer.writerow([self.frame_ids[i], f"{sum(row):.4f}"] + [f"{v:.4f}" for v in row])
+        print(f"Profiler trace written to {path}")
+        return path
+
+    def draw(self, screen):
+        if not self.show_overlay:
+            return
+        if self._font is None:
+            self._font = pygame.font.Font(None, 18)
+
+        # Percentiles need a sort per section; rebuild the panel twice a second
+        self._overlay_age -= 1
+        if self._overlay_age <= 0 or self._panel is None:
+            self._overlay_age = 30
+            self._panel = self._render_panel(screen.get_width() - 20)
+        screen.blit(self._panel, (10, 60))
+
+    def _render_panel(self, width):
+        lines = self._build_overlay_lines()
+        line_height = 14
+        panel = pygame.Surface((width, line_height * len(lines) + 8), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        for i, line in enumerate(lines):
+            text = self._font.render(line, True, (200, 255, 200))
+            panel.blit(text, (4, 4 + i * line_height))
+        return panel
+
+    def _build_overlay_lines(self):
+        lines = ["section              p50    p95    p99 (ms)"]
+        for name, (p50, p95, p99) in self.percentiles().items():
+            lines.append(f"{name:<20}{p50:6.2f} {p95:6.2f} {p99:6.2f}")
+
+        totals = sorted(self.frame_totals())
+        if totals:
+            last = len(totals) - 1
+            lines.append(f"{'frame':<20}{totals[last // 2]:6.2f} {totals[int(last * 0.95)]:6.2f} {totals[int(last * 0.99)]:6.2f}")
+
+        items = [f"{k}={v}" for k, v in self.counts.items()]
+        for i in range(0, len(items), 3):
+            lines.append("  ".join(items[i:i + 3]))
+        return lines
+
+
+class SpikeCapture:
+    """
+    Keeps cProfile data only for frames that blow the budget.
+
+    mode 'current': cProfile runs every frame and is thrown away unless that
+    frame went over budget, so the spike frame itself is captured.
+    mode 'next': frames are only timed; a spike arms cProfile for the
+    following frames. Much cheaper, but misses the first occurrence.
+
+    In both modes a capture covers `capture_frames` frames and is written to
+    `out_dir` as a .prof file plus a readable .txt summary.
+    """
+    def __init__(self, budget_ms=25.0, mode='current', capture_frames=1, out_dir='spikes', max_captures=20, enabled=False):
+        self.enabled = enabled
+        self.budget_ms = budget_ms
+        self.mode = mode
+        self.capture_frames = capture_frames
+        self.out_dir = out_dir
+        self.max_captures = max_captures
+        self.captures = 0
+        self.frame = 0
+
+        self._start = 0.0
+        self._profile = None
+        self._remaining = 0  # Frames still to add to the capture in progress
+        self._trigger = None  # (frame, elapsed_ms, counts) of the spike
+
+    def toggle(self):
+        if self._profile is not None:
+            self._profile.disable()
+        self._profile = None
+        self._remaining = 0
+        self.enabled = not self.enabled
+        print(f"Spike capture {'on' if self.enabled else 'off'} (budget {self.budget_ms:.1f} ms)")
+        if self.enabled:
+            self.begin_frame()
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        # Once max_captures are written, 'current' mode stops paying for cProfile
+        wanted = self._remaining > 0 or (self.mode == 'current' and self.captures < self.max_captures)
+        if self._profile is None and wanted:
+            import cProfile  # Only once capture is switched on
+            self._profile = cProfile.Profile()
+        if self._profile is not None:
+            self._profile.enable()
+        self._start = time.perf_counter()
+
+    def cancel_frame(self):
+        """For a frame that ends without work (suspended): stop profiling it and drop it."""
+        if self._profile is None:
+            return
+        self._profile.disable()
+        if self._remaining == 0:
+            self._profile = None
+
+    def end_frame(self, counts_fn=None):
+        if not self.enabled:
+            return
+        elapsed_ms = (time.perf_counter() - self._start) * 1000.0
+        profile = self._profile
+        if profile is not None:
+            profile.disable()
+        frame = self.frame
+        self.frame += 1
+
+        if self._remaining > 0:
+            # Capture in progress: this frame is part of it
+            self._remaining -= 1
+            if self._remaining == 0:
+                self._write(profile)
+            return
+
+        if elapsed_ms <= self.budget_ms or self.captures >= self.max_captures:
+            if self.mode == 'current':
+                self._profile = None  # Discard the healthy frame
+            return
+
+        counts = counts_fn() if counts_fn else {}
+        self._trigger = (frame, elapsed_ms, counts)
+        if self.mode == 'current':
+            self._remaining = self.capture_frames - 1
+            if self._remaining == 0:
+                self._write(profile)
+        else:
+            self._profile = None
+            self._remaining = self.capture_frames
+
+    def _write(self, profile):
+        frame, elapsed_ms, counts = self._trigger
+        self.captures += 1
+        self._profile = None
+
+        os.makedirs(self.out_dir, exist_ok=True)
+        base = os.path.join(self.out_dir, f"spike_f{frame:06d}_{elapsed_ms:.0f}ms")
+        profile.dump_stats(base + ".prof")
+
+        with open(base + ".txt", 'w') as f:
+            f.write(f"frame: {frame}\n")
+            f.write(f"frame_ms: {elapsed_ms:.3f}\n")
+            f.write(f"budget_ms: {self.budget_ms:.3f}\n")
+            f.write(f"mode: {self.mode}\n")
+            f.write(f"frames_captured: {self.capture_frames}\n")
+            for name, value in counts.items():
+                f.write(f"{name}: {value}\n")
+            f.write("\n")
+            import pstats
+            stats = pstats.Stats(profile, stream=f)
+            stats.sort_stats('cumulative').print_stats(40)
+        print(f"Spike captured: frame {frame} took {elapsed_ms:.1f} ms -> {base}.prof")
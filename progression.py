@@ -2,68 +2,91 @@
 Chainfall - Progression system (experience, upgrades)
 """
 import pygame
-import random
 import math
-
-class EnergyOrb:
-    def __init__(self, x, y, value=10, image=None):
-        self.x = x
-        self.y = y
-        self.value = value
-        self.image = image
-        self.radius = 8
-        self.active = True
-        self.lifetime = 5.0
-        self.timer = 0
-
-        # Movement
-        self.velocity_y = -50
-        self.gravity = 80
-
-        # Visual
-        self.color = (100, 255, 200)
-        self.glow_color = (50, 200, 150)
-        self.pulse = 0
-
-    def update(self, dt, player_x, player_y):
-        self.timer += dt
-        if self.timer >= self.lifetime:
-            self.active = False
-            return
-
-        # Pulse animation
-        self.pulse += dt * 5
-
-        # Initial upward movement with gravity
-        self.velocity_y += self.gravity * dt
-        self.y += self.velocity_y * dt
-
-        # Magnet effect towards player when close
-        dx = player_x - self.x
-        dy = player_y - self.y
-        dist = math.sqrt(dx * dx + dy * dy)
-
-        if dist < 150:
-            # Attract to player
-            speed = 300 * (1 - dist / 150)
-            if dist > 0:
-                self.x += (dx / dist) * speed * dt
-                self.y += (dy / dist) * speed * dt
-
-    def draw(self, screen):
-        if not self.active:
-            return
-
-        pulse_offset = math.sin(self.pulse) * 2
-        glow_radius = int(self.radius + 4 + pulse_offset)
-
-        if self.image:
-             # Draw sprite centered
-             rect = self.image.get_rect(center=(int(self.x), int(self.y)))
-             screen.blit(self.image, rect)
-        else:
-            pygame.draw.circle(screen, self.glow_color, (int(self.x), int(self.y)), glow_radius)
-            pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
+from array import array
+from itertools import compress
+import rng
+import shapes
+import telemetry
+import timers
+import view
+from config import ORB_MERGE_RADIUS
+
+_random = rng.stream('progression')
+
+class OrbField:
+    """
+    Every live energy orb, as parallel arrays ordered oldest first. Merging
+    folds newer orbs into older ones, so spawn times never decrease along the
+    arrays and the expired orbs are always a prefix.
+    """
+    radius = 8
+    lifetime = 5.0
+    gravity = 80
+    launch_velocity = -50  # Initial upward movement
+    merge_window = 32      # Newest orbs a spawn checks for merging; a burst of kills lands among them
+
+    # Visual
+    color = (100, 255, 200)
+    glow_color = (50, 200, 150)
+
+    def __init__(self):
+        self.xs = array('d')
+        self.ys = array('d')
+        self.velocity_ys = array('d')
+        self.pulses = array('d')
+        self.born = array('d')    # Game time (timers.now()) the orb spawned
+        self.values = array('i')
+
+    def __len__(self):
+        return len(self.xs)
+
+    def add(self, x, y, value):
+        self.xs.append(x)
+        self.ys.append(y)
+        self.velocity_ys.append(self.launch_velocity)
+        self.pulses.append(0.0)
+        self.born.append(timers.now())
+        self.values.append(value)
+
+    def nearest(self, x, y, radius):
+        """Index of the newest orb (of the last merge_window) within radius of (x, y), or -1."""
+        xs = self.xs
+        ys = self.ys
+        limit = radius * radius
+        for i in range(len(xs) - 1, max(len(xs) - self.merge_window, 0) - 1, -1):
+            dx = xs[i] - x
+            dy = ys[i] - y
+            if dx * dx + dy * dy <= limit:
+                return i
+        return -1
+
+    def expire(self, now):
+        """Drop the orbs older than lifetime."""
+        born = self.born
+        cutoff = now - self.lifetime
+        count = 0
+        while count < len(born) and born[count] <= cutoff:
+            count += 1
+        if count:
+            for column in self.columns():
+                del column[:count]
+
+    def renew(self, i):
+        """Restamp orb i as spawned now and move it to the end, behind every older orb, as expire() expects."""
+        for column in self.columns():
+            value = column.pop(i)
+            column.append(value)
+        self.born[-1] = timers.now()
+
+    def keep(self, mask):
+        """Compact the arrays down to the orbs whose mask entry is true."""
+        for column in self.columns():
+            column[:] = array(column.typecode, compress(column, mask))
+
+    def columns(self):
+        """Every per-orb array, in a fixed order (snapshots rely on it)."""
+        return (self.xs, self.ys, self.velocity_ys, self.pulses, self.born, self.values)
 
 
 class Upgrade:
@@ -86,7 +109,9 @@ class ProgressionManager:
         self.exp_to_next = 100
 
         # Orbs
-        self.orbs = []
+        self.orbs = OrbField()
+        self.merge_radius = ORB_MERGE_RADIUS  # New orbs this close to a live one join it
+        self.merge_pass = False               # Load governor: also merge live orbs every step
 
         # Upgrade state
         self.upgrade_active = False
@@ -115,45 +140,116 @@ class ProgressionManager:
 
     def init_fonts(self):
         if self.font is None:
-            self.font = pygame.font.Font(None, 28)
-            self.title_font = pygame.font.Font(None, 42)
+            self.font = view.font(28)
 
     def spawn_orb(self, x, y, value=10):
-        self.orbs.append(EnergyOrb(x, y, value, self.orb_image))
+        # A kill close to a live orb feeds that orb instead of adding one
+        orbs = self.orbs
+        target = orbs.nearest(x, y, self.merge_radius)
+        if target < 0:
+            orbs.add(x, y, value)
+            return
+        orbs.values[target] += value
+        if orbs.born[target] != timers.now():
+            # The new XP gets a full lifetime: an older orb is restamped, not left to expire early
+            orbs.renew(target)
 
     def update(self, dt, player):
         if self.upgrade_active:
             return  # Pause during upgrade selection
 
-        # Update orbs
-        for orb in self.orbs:
-            orb.update(dt, player.x, player.y)
-
-            # Check collection
-            if orb.active:
-                dx = player.x - orb.x
-                dy = player.y - orb.y
+        orbs = self.orbs
+        orbs.expire(timers.now())
+        if self.merge_pass:
+            self.merge_orbs()
+
+        xs = orbs.xs
+        ys = orbs.ys
+        velocity_ys = orbs.velocity_ys
+        pulses = orbs.pulses
+        px = player.x
+        py = player.y
+        reach = player.width / 2 + orbs.radius
+        fall = orbs.gravity * dt
+        pulse_step = dt * 5
+        keep = None
+
+        # One pass: pulse, gravity, magnet and collection, one sqrt for orbs out of magnet range
+        for i in range(len(xs)):
+            pulses[i] += pulse_step
+            velocity_y = velocity_ys[i] + fall
+            velocity_ys[i] = velocity_y
+            x = xs[i]
+            y = ys[i] + velocity_y * dt
+
+            dx = px - x
+            dy = py - y
+            dist = math.sqrt(dx * dx + dy * dy)
+            if dist < 150 and dist > 0:
+                # Attract to player
+                step = 300 * (1 - dist / 150) * dt / dist
+                x += dx * step
+                y += dy * step
+                dx = px - x
+                dy = py - y
                 dist = math.sqrt(dx * dx + dy * dy)
+            xs[i] = x
+            ys[i] = y
 
-                if dist < player.width / 2 + orb.radius:
-                    self.experience += orb.value
-                    orb.active = False
-
-                    # Check level up
-                    if self.experience >= self.exp_to_next:
-                        self.level_up()
+            if dist < reach:
+                if keep is None:
+                    keep = [True] * len(xs)
+                keep[i] = False
 
-        self.orbs = [o for o in self.orbs if o.active]
+        if keep is None:
+            return
+        values = orbs.values
+        for i, kept in enumerate(keep):
+            if not kept:
+                self.experience += values[i]
+                telemetry.log(telemetry.ORB_COLLECTED, values[i])
+
+                # Check level up
+                if self.experience >= self.exp_to_next:
+                    self.level_up()
+        orbs.keep(keep)
+
+    def merge_orbs(self):
+        """
+        Fold orbs sharing a merge_radius grid cell into the newest one; total XP
+        is unchanged. The merged orb keeps the newest birth time, so it lasts as
+        long as its youngest part would have, and born stays in spawn order for expire().
+        """
+        orbs = self.orbs
+        cell = self.merge_radius
+        xs = orbs.xs
+        ys = orbs.ys
+        values = orbs.values
+        kept = {}
+        mask = None
+        for i in range(len(xs) - 1, -1, -1):
+            key = (int(xs[i] // cell), int(ys[i] // cell))
+            target = kept.get(key)
+            if target is None:
+                kept[key] = i
+            else:
+                values[target] += values[i]
+                if mask is None:
+                    mask = [True] * len(values)
+                mask[i] = False
+        if mask is not None:
+            orbs.keep(mask)
 
     def level_up(self):
         self.level += 1
+        telemetry.log(telemetry.LEVEL_UP, self.level)
         self.experience -= self.exp_to_next
         self.exp_to_next = int(self.exp_to_next * 1.5)
 
         # Show upgrade selection
         self.upgrade_active = True
         self.selected_upgrade = 0
-        self.upgrade_options = random.sample(self.upgrade_pool, min(3, len(self.upgrade_pool)))
+        self.upgrade_options = _random.sample(self.upgrade_pool, min(3, len(self.upgrade_pool)))
 
     def handle_input(self, event, player, combat_manager):
         if not self.upgrade_active:
@@ -185,44 +281,73 @@ class ProgressionManager:
     def draw(self, screen):
         self.init_fonts()
 
-        # Draw orbs
-        for orb in self.orbs:
-            orb.draw(screen)
+        self._draw_orbs(screen)
 
         # Draw XP bar
-        bar_width = self.screen_width - 40
-        bar_height = 12
-        bar_x = 20
-        bar_y = 20
+        s = view.scale
+        bar_width = (self.screen_width - 40) * s
+        bar_height = 12 * s
+        bar_x = 20 * s
+        bar_y = 20 * s
+        rounding = round(6 * s)
 
         # Background
-        pygame.draw.rect(screen, (40, 40, 40), (bar_x, bar_y, bar_width, bar_height), border_radius=6)
+        pygame.draw.rect(screen, (40, 40, 40), (bar_x, bar_y, bar_width, bar_height), border_radius=rounding)
         # Fill
         fill_ratio = self.experience / self.exp_to_next
-        pygame.draw.rect(screen, (100, 255, 200), (bar_x, bar_y, bar_width * fill_ratio, bar_height), border_radius=6)
+        pygame.draw.rect(screen, (100, 255, 200), (bar_x, bar_y, bar_width * fill_ratio, bar_height), border_radius=rounding)
         # Border
-        pygame.draw.rect(screen, (100, 255, 200), (bar_x, bar_y, bar_width, bar_height), 2, border_radius=6)
+        pygame.draw.rect(screen, (100, 255, 200), (bar_x, bar_y, bar_width, bar_height), max(1, round(2 * s)),
+                         border_radius=rounding)
 
         # Level text
         level_text = self.font.render(f"LV {self.level}", True, (255, 255, 255))
-        screen.blit(level_text, (bar_x, bar_y + bar_height + 5))
+        screen.blit(level_text, (bar_x, bar_y + bar_height + 5 * s))
 
         # Draw upgrade selection if active
         if self.upgrade_active:
             self._draw_upgrade_screen(screen)
 
+    def _draw_orbs(self, screen):
+        orbs = self.orbs
+        image = self.orb_image
+        s = view.scale
+        if image:
+            # Draw sprites centered, in one batch
+            screen.blits([(image, image.get_rect(center=(int(x * s), int(y * s)))) for x, y in zip(orbs.xs, orbs.ys)],
+                         doreturn=False)
+            return
+        # Pre-rendered glow and core, one surface per glow radius (the pulse bucket)
+        radius = orbs.radius
+        core_radius = int(radius * s)
+        sprites = {}
+        batch = []
+        for x, y, pulse in zip(orbs.xs, orbs.ys, orbs.pulses):
+            glow_radius = int((radius + 4 + math.sin(pulse) * 2) * s)
+            sprite = sprites.get(glow_radius)
+            if sprite is None:
+                sprite = sprites[glow_radius] = shapes.glow_circle(orbs.glow_color, glow_radius, orbs.color, core_radius)
+            surface, dx, dy = sprite
+            batch.append((surface, (int(x * s) + dx, int(y * s) + dy)))
+        screen.blits(batch, doreturn=False)
+
     def _draw_upgrade_screen(self, screen):
+        if self.title_font is None:
+            self.title_font = view.font(42)  # Not needed until the first level-up
+        s = view.scale
+        center_x = screen.get_width() // 2
+
         # Darken background
-        overlay = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
+        overlay = pygame.Surface(view.screen_size(), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 180))
         screen.blit(overlay, (0, 0))
 
         # Title
         title = self.title_font.render("LEVEL UP!", True, (100, 255, 200))
-        screen.blit(title, (self.screen_width // 2 - title.get_width() // 2, 100))
+        screen.blit(title, (center_x - title.get_width() // 2, 100 * s))
 
         subtitle = self.font.render("Choose an upgrade", True, (200, 200, 200))
-        screen.blit(subtitle, (self.screen_width // 2 - subtitle.get_width() // 2, 150))
+        screen.blit(subtitle, (center_x - subtitle.get_width() // 2, 150 * s))
 
         # Draw upgrade options
         option_width = 120
@@ -237,21 +362,23 @@ class ProgressionManager:
 
             # Box
             color = (100, 255, 200) if i == self.selected_upgrade else (80, 80, 80)
-            pygame.draw.rect(screen, color, (x, y, option_width, option_height), 3, border_radius=8)
+            pygame.draw.rect(screen, color, (x * s, y * s, option_width * s, option_height * s),
+                             max(1, round(3 * s)), border_radius=round(8 * s))
 
             if i == self.selected_upgrade:
-                pygame.draw.rect(screen, (30, 60, 50), (x + 3, y + 3, option_width - 6, option_height - 6), border_radius=6)
+                pygame.draw.rect(screen, (30, 60, 50), ((x + 3) * s, (y + 3) * s, (option_width - 6) * s,
+                                                        (option_height - 6) * s), border_radius=round(6 * s))
 
             # Name
             name_text = self.font.render(upgrade.name, True, (255, 255, 255))
-            name_x = x + (option_width - name_text.get_width()) // 2
-            screen.blit(name_text, (name_x, y + 20))
+            name_x = x * s + (option_width * s - name_text.get_width()) // 2
+            screen.blit(name_text, (name_x, (y + 20) * s))
 
             # Description
             desc_text = self.font.render(upgrade.description, True, (180, 180, 180))
-            desc_x = x + (option_width - desc_text.get_width()) // 2
-            screen.blit(desc_text, (desc_x, y + 60))
+            desc_x = x * s + (option_width * s - desc_text.get_width()) // 2
+            screen.blit(desc_text, (desc_x, (y + 60) * s))
 
         # Instructions
         inst = self.font.render("A/D to select, SPACE to confirm", True, (150, 150, 150))
-        screen.blit(inst, (self.screen_width // 2 - inst.get_width() // 2, 420))
+        screen.blit(inst, (center_x - inst.get_width() // 2, 420 * s))
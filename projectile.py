@@ -1,20 +1,28 @@
 """
 Chainfall - Projectile management
 """
-import pygame
+import shapes
+import view
 
 class Projectile:
+    __slots__ = ('x', 'y', 'prev_x', 'prev_y', 'image', 'active')
+
+    radius = 5
+    speed = 600  # pixels per second
+    color = (255, 220, 100)
+    glow_color = (255, 180, 50)
+
     def __init__(self, x, y, image=None):
         self.x = x
         self.y = y
+        self.prev_x = x  # Position before the last update, the start of the swept hit test
+        self.prev_y = y
         self.image = image
-        self.radius = 5
-        self.speed = 600  # pixels per second
-        self.color = (255, 220, 100)
-        self.glow_color = (255, 180, 50)
         self.active = True
 
     def update(self, dt):
+        self.prev_x = self.x
+        self.prev_y = self.y
         self.y -= self.speed * dt
 
         # Deactivate if off screen
@@ -22,14 +30,19 @@ class Projectile:
             self.active = False
 
     def draw(self, screen):
+        s = view.scale
         if self.image:
-            rect = self.image.get_rect(center=(int(self.x), int(self.y)))
+            rect = self.image.get_rect(center=(int(self.x * s), int(self.y * s)))
             screen.blit(self.image, rect)
         else:
-            # Draw glow
-            pygame.draw.circle(screen, self.glow_color, (int(self.x), int(self.y)), self.radius + 3)
-            # Draw core
-            pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
+            # Glow and core, pre-rendered
+            surface, dx, dy = self.shape()
+            screen.blit(surface, (int(self.x * s) + dx, int(self.y * s) + dy))
+
+    @classmethod
+    def shape(cls):
+        s = view.scale
+        return shapes.glow_circle(cls.glow_color, int((cls.radius + 3) * s), cls.color, int(cls.radius * s))
 
 
 class ProjectileManager:
@@ -48,6 +61,13 @@ class ProjectileManager:
         self.projectiles = [p for p in self.projectiles if p.active]
 
     def draw(self, screen):
+        if self.image is None:
+            # Every fallback shot is the same pre-rendered shape: one batch
+            surface, dx, dy = Projectile.shape()
+            s = view.scale
+            screen.blits([(surface, (int(p.x * s) + dx, int(p.y * s) + dy)) for p in self.projectiles],
+                         doreturn=False)
+            return
         for projectile in self.projectiles:
             projectile.draw(screen)
 
@@ -0,0 +1,225 @@
+"""
+Chainfall - Input recording and deterministic replay
+
+A replay log is the master RNG seed plus, per tick: dt, the held-key mask,
+the load governor level, a checksum of the simulation state after the tick,
+and the keys pressed before it, in order. Given the same seed, dt and inputs, World.update is
+deterministic, so playback reproduces the session and the checksums prove it.
+
+    python replay.py replays/session.cfr                # watch it
+    python replay.py replays/session.cfr --headless     # max speed, verify only
+"""
+import os
+import struct
+import sys
+import time
+import zlib
+
+import pygame
+import rng
+from governor import apply_level
+
+MAGIC = b'CFRP'
+VERSION = 4
+HEADER = struct.Struct('<4sHQHI')  # magic, version, seed, fps, tick count
+TICK = struct.Struct('<dHBIH')     # dt, held mask, load level, state checksum, press count; then one INPUT_KEYS index byte per press
+_STATE = struct.Struct('<6d5I')
+
+# Bit order of the held mask and indices of pressed keys. Only these keys reach the game.
+INPUT_KEYS = (
+    pygame.K_LEFT, pygame.K_RIGHT, pygame.K_a, pygame.K_d,
+    pygame.K_SPACE, pygame.K_RETURN, pygame.K_r, pygame.K_ESCAPE,
+)
+_KEY_BITS = {key: 1 << i for i, key in enumerate(INPUT_KEYS)}
+_KEY_INDEX = {key: i for i, key in enumerate(INPUT_KEYS)}
+
+
+def held_mask(keys):
+    mask = 0
+    for key, bit in _KEY_BITS.items():
+        if keys[key]:
+            mask |= bit
+    return mask
+
+
+def pressed_keys(events):
+    """INPUT_KEYS indices of the KEYDOWN events, in the order they came, repeats included."""
+    return bytes(_KEY_INDEX[event.key] for event in events
+                 if event.type == pygame.KEYDOWN and event.key in _KEY_INDEX)
+
+
+def state_checksum(world):
+    """CRC of the state most likely to diverge first."""
+    player = world.player
+    snake = world.entity_manager.snake
+    progression = world.progression_manager
+    return zlib.crc32(_STATE.pack(
+        player.x, player.fire_cooldown.remaining(), snake.head_x, snake.head_y,
+        world.difficulty_manager.game_time, world.difficulty_manager.spawn.remaining(),
+        len(snake.segments), len(snake.path_history), len(world.projectile_manager.projectiles),
+        len(progression.orbs), progression.experience,
+    ))
+
+
+class ReplayKeys:
+    """Stands in for pygame.key.get_pressed() during playback."""
+    def __init__(self, mask=0):
+        self.mask = mask
+
+    def __getitem__(self, key):
+        return bool(self.mask & _KEY_BITS.get(key, 0))
+
+
+def pressed_events(pressed):
+    """KEYDOWN events for the pressed key indices, in recorded order."""
+    return [pygame.event.Event(pygame.KEYDOWN, key=INPUT_KEYS[i]) for i in pressed]
+
+
+class Recorder:
+    """Buffers ticks in memory and writes them in blocks, off the per-frame path."""
+    def __init__(self, path, seed, fps, flush_every=600):
+        self.path = path
+        self.flush_every = flush_every
+        self.ticks = 0
+        self._buffer = bytearray()
+        self._pressed = bytearray()  # INPUT_KEYS indices pressed since the last recorded tick, in order
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, 'wb')
+        self._file.write(HEADER.pack(MAGIC, VERSION, seed, fps, 0))
+
+    def press(self, events):
+        """Queue the game keys pressed in events for the next recorded tick."""
+        self._pressed += pressed_keys(events)
+
+    def record_step(self, dt, keys, level, world):
+        """Record a World.update that just ran, with the presses queued before it."""
+        self.record(dt, held_mask(keys), self._pressed, level, state_checksum(world))
+        self._pressed.clear()
+
+    def record(self, dt, held, pressed, level, checksum):
+        self._buffer += TICK.pack(dt, held, level, checksum, len(pressed))
+        self._buffer += pressed
+        self.ticks += 1
+        if self.ticks % self.flush_every == 0:
+            self.flush()
+
+    def flush(self):
+        self._file.write(self._buffer)
+        self._buffer.clear()
+
+    def close(self):
+        if self._file is None:
+            return
+        self.flush()
+        # Patch the tick count into the header
+        self._file.seek(HEADER.size - 4)
+        self._file.write(struct.pack('<I', self.ticks))
+        self._file.close()
+        self._file = None
+        print(f"Replay written to {self.path} ({self.ticks} ticks)")
+
+
+def load(path):
+    """Returns (seed, fps, [(dt, held, pressed, level, checksum), ...]); pressed is bytes of INPUT_KEYS indices."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    magic, version, seed, fps, count = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a Chainfall replay")
+    if version != VERSION:
+        raise ValueError(f"{path} is replay version {version}, expected {VERSION}")
+    ticks = []
+    offset = HEADER.size
+    for _ in range(count):
+        dt, held, level, checksum, presses = TICK.unpack_from(data, offset)
+        offset += TICK.size
+        ticks.append((dt, held, data[offset:offset + presses], level, checksum))
+        offset += presses
+    return seed, fps, ticks
+
+
+def default_path():
+    return time.strftime("replays/session_%Y%m%d_%H%M%S.cfr")
+
+
+def play(path, headless=False, draw=None, stop_on_divergence=True):
+    """
+    Replay a log through a fresh World. Returns the first tick whose checksum
+    differs from the recording, or None if playback matched throughout.
+    """
+    from world import World
+    from asset_loader import AssetLoader
+    from config import SCREEN_WIDTH, SCREEN_HEIGHT, BG_COLOR
+
+    seed, fps, ticks = load(path)
+    if draw is None:
+        draw = not headless
+
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    clock = pygame.time.Clock()
+
+    loader = AssetLoader()
+    if draw:
+        loader.load_all()
+
+    rng.seed(seed)
+    world = World(SCREEN_WIDTH, SCREEN_HEIGHT, loader.assets)
+    keys = ReplayKeys()
+    diverged = None
+    played = 0
+    simulated = 0.0
+    started = time.perf_counter()
+
+    for index, (dt, held, pressed, level, checksum) in enumerate(ticks):
+        if not headless:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return diverged
+            clock.tick(fps)
+
+        for event in pressed_events(pressed):
+            world.handle_event(event)
+        keys.mask = held
+        apply_level(world, level)
+        world.update(dt, keys)
+        played += 1
+        simulated += dt
+
+        if diverged is None and state_checksum(world) != checksum:
+            diverged = index
+            print(f"Replay diverged at tick {index}")
+            if stop_on_divergence:
+                break
+        if draw:
+            world.draw(screen, BG_COLOR)
+            pygame.display.flip()
+
+    elapsed = time.perf_counter() - started
+    print(f"Replayed {played} of {len(ticks)} ticks ({simulated:.1f}s of game time) in {elapsed:.2f}s")
+    return diverged
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Play back a Chainfall replay log")
+    parser.add_argument('path')
+    parser.add_argument('--headless', action='store_true', help="no window, run as fast as possible")
+    parser.add_argument('--draw', action='store_true', help="with --headless, still render every frame")
+    parser.add_argument('--keep-going', action='store_true', help="continue past the first divergence")
+    args = parser.parse_args()
+
+    if args.headless:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    diverged = play(args.path, args.headless, args.draw if args.headless else None, not args.keep_going)
+    pygame.quit()
+    if diverged is not None:
+        return 1
+    print("Replay matched the recording")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
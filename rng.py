@@ -0,0 +1,47 @@
+"""
+Chainfall - Seeded random streams (one per subsystem)
+
+Each subsystem draws from its own random.Random, derived from one master
+seed, so a change in how often one subsystem rolls dice does not shift the
+rolls of another. Modules keep the stream object; seed() reseeds streams in
+place, so those references stay valid.
+"""
+import random
+
+_master_seed = None
+_streams = {}
+
+
+def seed(master_seed=None):
+    """Reseed every stream. None picks a fresh seed; the one in use is returned."""
+    global _master_seed
+    if master_seed is None:
+        master_seed = random.SystemRandom().randrange(2 ** 63)
+    _master_seed = master_seed
+    for name, stream_rng in _streams.items():
+        stream_rng.seed(f"{master_seed}:{name}")
+    return master_seed
+
+
+def current_seed():
+    if _master_seed is None:
+        seed()
+    return _master_seed
+
+
+def stream(name):
+    """The random.Random for `name`, created on first use."""
+    stream_rng = _streams.get(name)
+    if stream_rng is None:
+        stream_rng = _streams[name] = random.Random(f"{current_seed()}:{name}")
+    return stream_rng
+
+
+def get_states():
+    """name -> random.Random state, for snapshots."""
+    return {name: stream_rng.getstate() for name, stream_rng in _streams.items()}
+
+
+def set_states(states):
+    for name, state in states.items():
+        stream(name).setstate(state)
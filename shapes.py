@@ -0,0 +1,71 @@
+"""
+Chainfall - Cached fallback shapes
+
+Without sprites, entities draw circles and rounded rects instead, and
+rasterizing those every frame costs more than blitting a sprite. Each
+shape is drawn once into a surface, keyed by shape, size and color, and
+blitted like a sprite after that. The shapes are solid, so the surfaces
+use an RLE colorkey rather than per-pixel alpha (the cheapest blit SDL
+has), and are cropped to exactly the pixels pygame.draw touched: the
+result is the same as drawing onto the screen directly.
+"""
+import pygame
+
+_cache = {}
+
+
+def _canvas(size, colors):
+    """A blank surface filled with a colorkey that none of colors uses."""
+    key = (255, 0, 255)
+    while key in colors:
+        key = (key[0], key[1] + 1, key[2])
+    surface = pygame.Surface(size)
+    surface.fill(key)
+    surface.set_colorkey(key)
+    return surface
+
+
+def _finish(surface, bounds):
+    """The touched part of surface, RLE-encoded and in the display's pixel format when there is one."""
+    key = surface.get_colorkey()
+    surface = surface.subsurface(bounds).copy()
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert()
+    surface.set_colorkey(key, pygame.RLEACCEL)
+    return surface
+
+
+def circle(color, radius):
+    """(surface, dx, dy): blit at (x + dx, y + dy) to draw a circle centered on integer (x, y)."""
+    key = ('circle', color, radius)
+    cached = _cache.get(key)
+    if cached is None:
+        pad = radius + 2
+        surface = _canvas((pad * 2 + 1, pad * 2 + 1), (color,))
+        bounds = pygame.draw.circle(surface, color, (pad, pad), radius)
+        cached = _cache[key] = (_finish(surface, bounds), bounds.x - pad, bounds.y - pad)
+    return cached
+
+
+def glow_circle(glow_color, glow_radius, color, radius):
+    """A circle drawn over a larger glow circle, as one surface. Same return as circle()."""
+    key = ('glow_circle', glow_color, glow_radius, color, radius)
+    cached = _cache.get(key)
+    if cached is None:
+        pad = max(glow_radius, radius) + 2
+        surface = _canvas((pad * 2 + 1, pad * 2 + 1), (glow_color, color))
+        bounds = pygame.draw.circle(surface, glow_color, (pad, pad), glow_radius)
+        bounds.union_ip(pygame.draw.circle(surface, color, (pad, pad), radius))
+        cached = _cache[key] = (_finish(surface, bounds), bounds.x - pad, bounds.y - pad)
+    return cached
+
+
+def rounded_rect(color, width, height, border_radius):
+    """A filled rounded rect; blit the surface at the rect's top-left corner."""
+    key = ('rounded_rect', color, width, height, border_radius)
+    surface = _cache.get(key)
+    if surface is None:
+        surface = _canvas((width, height), (color,))
+        pygame.draw.rect(surface, color, (0, 0, width, height), border_radius=border_radius)
+        surface = _cache[key] = _finish(surface, surface.get_rect())
+    return surface
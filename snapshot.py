@@ -0,0 +1,337 @@
+"""
+Chainfall - Binary game-state snapshots
+
+snapshot(world) packs the full simulation state into a compact, versioned
+byte string; restore(world, data) rebuilds it in place. Everything is
+packed with struct and array (one flat array per object type, not a pickle
+of the object graph), so taking one costs about as much as touching each
+attribute once. Sprites and fonts are not state: restore() reuses the images
+the world's managers already hold, and takes snake segments and groups from
+the snake's SegmentPool.
+"""
+import struct
+from array import array
+from itertools import accumulate, chain, repeat
+from operator import attrgetter
+
+import rng
+import timers
+from entity_core import SegmentGroup, SnakeSegment
+from projectile import Projectile
+
+MAGIC = b'CFSS'
+VERSION = 7
+
+_HEADER = struct.Struct('<4sH')
+_COUNT = struct.Struct('<I')
+_CLOCK = struct.Struct('<d')
+_PLAYER = struct.Struct('<6d?')
+_SNAKE = struct.Struct('<2dbBd4dBiI')
+_DIFFICULTY = struct.Struct('<2di3id2i?')
+_PROGRESSION = struct.Struct('<3i?iidii')
+_COMBAT = struct.Struct('<i')
+_EFFECTS = struct.Struct('<i')
+_WORLD = struct.Struct('<?')
+_RNG_TAIL = struct.Struct('<?d')
+
+_STOPPED = float('nan')  # Deadline of a timer that is not running
+
+_SNAKE_STATES = ("MOVING", "DROPPING")
+_DIRECTIONS = ("RIGHT", "LEFT", "UP", "DOWN")
+
+
+class _Writer:
+    def __init__(self):
+        self.parts = [_HEADER.pack(MAGIC, VERSION)]
+
+    def pack(self, fmt, *values):
+        self.parts.append(fmt.pack(*values))
+
+    def array(self, typecode, values):
+        data = values if isinstance(values, array) else array(typecode, values)
+        self.parts.append(_COUNT.pack(len(data)))
+        self.parts.append(data.tobytes())
+
+    def doubles(self, count, values):
+        """Like array('d', values) for `count` floats, but struct packs a long iterable about twice as fast."""
+        self.parts.append(_COUNT.pack(count))
+        self.parts.append(struct.pack(f'<{count}d', *values))
+
+    def getvalue(self):
+        return b''.join(self.parts)
+
+
+class _Reader:
+    def __init__(self, data):
+        self.view = memoryview(data)
+        self.offset = 0
+        magic, version = self.unpack(_HEADER)
+        if magic != MAGIC:
+            raise ValueError("not a Chainfall snapshot")
+        if version != VERSION:
+            raise ValueError(f"snapshot version {version}, expected {VERSION}")
+
+    def unpack(self, fmt):
+        values = fmt.unpack_from(self.view, self.offset)
+        self.offset += fmt.size
+        return values
+
+    def array(self, typecode):
+        (count,) = self.unpack(_COUNT)
+        result = array(typecode)
+        size = count * result.itemsize
+        result.frombytes(self.view[self.offset:self.offset + size])
+        self.offset += size
+        return result
+
+
+def _records(objects, fields):
+    """The fields of every object, row after row, as one flat iterable."""
+    return chain.from_iterable(map(attrgetter(*fields), objects))
+
+
+def _rows(values, width):
+    return zip(*[iter(values)] * width)
+
+
+def _deadline(timer):
+    return timer.deadline if timer.running else _STOPPED
+
+
+def _resume(timer, deadline):
+    if deadline == deadline:  # Not NaN
+        timer.start_at(deadline)
+    else:
+        timer.stop()
+
+
+_SEGMENT_FIELDS = ('x', 'y', 'render_x', 'render_y', 'vel_rx', 'vel_ry',
+                   'velocity_y', 'hit_scale', 'facing_angle')
+_ACTIVE = attrgetter('active')
+_GROUP = attrgetter('group')
+_SEGMENT_STATE = attrgetter('hit', 'active', 'is_head', 'facing_dir', 'group')
+_DIRECTION_CODES = {name: i for i, name in enumerate(_DIRECTIONS)}
+
+
+def snapshot(world):
+    w = _Writer()
+
+    # Game clock: every timer below is an absolute deadline on it
+    w.pack(_CLOCK, timers.now())
+
+    # Player
+    p = world.player
+    w.pack(_PLAYER, p.x, p.y, p.speed, p.velocity_x, p.fire_rate, _deadline(p.fire_cooldown), bool(p.rapid_fire))
+
+    # Projectiles
+    projectiles = world.projectile_manager.projectiles
+    w.doubles(2 * len(projectiles), _records(projectiles, ('x', 'y')))
+    w.array('b', bytes(map(_ACTIVE, projectiles)))
+
+    # Snake. Groups referenced by segments or current_group but already
+    # dropped from snake.groups are kept too, after the listed ones.
+    snake = world.entity_manager.snake
+    segments = snake.segments
+    hits, actives, heads, facings, owners = zip(*map(_SEGMENT_STATE, segments)) if segments else ((),) * 5
+    groups = list(snake.groups)
+    group_index = {g: i for i, g in enumerate(groups)}
+    for g in dict.fromkeys(chain(owners, (snake.current_group,))):
+        if g is not None and g not in group_index:
+            group_index[g] = len(groups)
+            groups.append(g)
+    group_index[None] = -1
+
+    w.pack(_SNAKE, snake.head_x, snake.head_y, snake.direction, _SNAKE_STATES.index(snake.state),
+           snake.target_y, _deadline(snake.snap), _deadline(snake.freeze), snake.prev_head_x, snake.prev_head_y,
+           _DIRECTIONS.index(snake.head_dir), group_index[snake.current_group], len(snake.groups))
+    w.doubles(2 * len(snake.path_history), chain.from_iterable(snake.path_history))
+
+    # Groups as columns. Membership is every group's segment indices, one
+    # group after another, split by starts; -1 for a segment no longer in the snake.
+    w.array('i', [g.hp for g in groups])
+    w.array('i', [g.max_hp for g in groups])
+    w.array('d', [_deadline(g.flash) for g in groups])
+    segment_index = {seg: i for i, seg in enumerate(segments)}
+    lists = [g.segments for g in groups]
+    w.array('i', [0, *accumulate(map(len, lists))])
+    w.array('i', list(map(segment_index.get, chain.from_iterable(lists), repeat(-1))))
+
+    w.doubles(len(segments) * len(_SEGMENT_FIELDS), _records(segments, _SEGMENT_FIELDS))
+    w.array('d', [hit.deadline if hit.running else _STOPPED for hit in hits])
+    w.array('b', bytes(actives))
+    w.array('b', bytes(heads))
+    w.array('b', bytes(map(_DIRECTION_CODES.__getitem__, facings)))
+    w.array('i', list(map(group_index.__getitem__, owners)))
+
+    # Orbs
+    for column in world.progression_manager.orbs.columns():
+        w.array(column.typecode, column)
+
+    # Effects (damage numbers, hit bursts)
+    effects = world.combat_manager.effects
+    w.pack(_EFFECTS, effects.head)
+    for column in effects.columns():
+        w.array(column.typecode, column)
+
+    # Difficulty, progression, combat, game over
+    d = world.difficulty_manager
+    w.pack(_DIFFICULTY, d.game_time, _deadline(d.spawn), d.difficulty_level, d.module_count, d.core_integrity,
+           d.module_integrity, d.spawn_delay, d.enemy_speed, d.max_enemies, d.spawn_ready)
+
+    pm = world.progression_manager
+    options = array('b', [pm.upgrade_pool.index(u) for u in pm.upgrade_options])
+    w.pack(_PROGRESSION, pm.experience, pm.level, pm.exp_to_next, pm.upgrade_active, pm.selected_upgrade,
+           pm.stats['damage'], pm.stats['fire_rate'], pm.stats['projectile_speed'], pm.stats['move_speed'])
+    w.array('b', options)
+    w.pack(_COMBAT, world.combat_manager.projectile_damage)
+    w.pack(_WORLD, world.game_over)
+
+    # RNG streams, so play continues exactly as it would have
+    states = rng.get_states()
+    names = sorted(states)
+    w.array('B', "\0".join(names).encode())
+    for name in names:
+        version, internal, gauss = states[name]
+        w.array('I', internal)
+        w.pack(_RNG_TAIL, gauss is not None, gauss or 0.0)
+
+    return w.getvalue()
+
+
+def restore(world, data):
+    r = _Reader(data)
+
+    # Game clock, before any timer is restarted on it
+    (clock,) = r.unpack(_CLOCK)
+    timers.reset(clock)
+
+    # Player
+    p = world.player
+    p.x, p.y, p.speed, p.velocity_x, p.fire_rate, fire, p.rapid_fire = r.unpack(_PLAYER)
+    _resume(p.fire_cooldown, fire)
+
+    # Projectiles
+    pm = world.projectile_manager
+    flat = r.array('d')
+    active = r.array('b')
+    pm.projectiles = []
+    for i, is_active in enumerate(active):
+        projectile = Projectile(flat[i * 2], flat[i * 2 + 1], pm.image)
+        projectile.active = bool(is_active)
+        pm.projectiles.append(projectile)
+
+    # Snake
+    snake = world.entity_manager.snake
+    (snake.head_x, snake.head_y, snake.direction, state, snake.target_y, snap,
+     freeze, snake.prev_head_x, snake.prev_head_y, head_dir, current, listed) = r.unpack(_SNAKE)
+    _resume(snake.snap, snap)
+    _resume(snake.freeze, freeze)
+    snake.state = _SNAKE_STATES[state]
+    snake.head_dir = _DIRECTIONS[head_dir]
+    flat = r.array('d')
+    snake.path_history = list(zip(flat[0::2], flat[1::2]))
+
+    # Hand the current body back to the pool, then take the snapshot's out of it.
+    # timers.reset() above already stopped every timer they hold.
+    pool = snake.pool
+    free_groups = pool.free_groups
+    free_segments = pool.free_segments
+    old_groups = dict.fromkeys(chain(snake.groups, map(_GROUP, snake.segments), (snake.current_group,)))
+    old_groups.pop(None, None)
+    free_groups.extend(old_groups)
+    free_segments.extend(snake.segments)
+
+    hps = r.array('i')
+    max_hps = r.array('i')
+    flashes = r.array('d')
+    starts = r.array('i')
+    members = r.array('i')
+    groups = []
+    for hp, max_hp, flash in zip(hps, max_hps, flashes):
+        group = free_groups.pop() if free_groups else SegmentGroup()
+        group.hp = hp
+        group.max_hp = max_hp
+        if flash == flash:  # Not NaN
+            group.flash.start_at(flash)
+        groups.append(group)
+
+    records = r.array('d')
+    hits = r.array('d')
+    actives = r.array('b')
+    heads = r.array('b')
+    facings = r.array('b')
+    owners = r.array('i')
+    image = snake.image
+    head_image = snake.head_image
+    owner_groups = groups + [None]  # Index -1: no group
+    segments = []
+    for (seg_values, hit, active, is_head, facing, owner) in zip(
+            _rows(records, len(_SEGMENT_FIELDS)), hits, map(bool, actives), map(bool, heads),
+            map(_DIRECTIONS.__getitem__, facings), map(owner_groups.__getitem__, owners)):
+        seg = free_segments.pop() if free_segments else SnakeSegment(0.0, 0.0)
+        (seg.x, seg.y, seg.render_x, seg.render_y, seg.vel_rx, seg.vel_ry,
+         seg.velocity_y, seg.hit_scale, seg.facing_angle) = seg_values
+        seg.image = image
+        seg.head_image = head_image if is_head else None
+        seg.active = active
+        seg.is_head = is_head
+        seg.facing_dir = facing
+        seg.group = owner
+        if hit == hit:
+            seg.hit.start_at(hit)
+        segments.append(seg)
+
+    member_segments = list(map((segments + [None]).__getitem__, members))  # Index -1: left the snake
+    for group, start, stop in zip(groups, starts, starts[1:]):
+        group.segments[:] = filter(None, member_segments[start:stop])
+
+    snake.segments = segments
+    snake.groups = groups[:listed]
+    snake.current_group = owner_groups[current]
+
+    # Orbs
+    prog = world.progression_manager
+    for column in prog.orbs.columns():
+        column[:] = r.array(column.typecode)
+
+    # Effects (damage numbers, hit bursts)
+    combat = world.combat_manager
+    effects = combat.effects
+    (effects.head,) = r.unpack(_EFFECTS)
+    for column in effects.columns():
+        column[:] = r.array(column.typecode)
+    effects.recount()
+
+    # Difficulty, progression, combat
+    d = world.difficulty_manager
+    (d.game_time, spawn, d.difficulty_level, d.module_count, d.core_integrity,
+     d.module_integrity, d.spawn_delay, d.enemy_speed, d.max_enemies, d.spawn_ready) = r.unpack(_DIFFICULTY)
+    _resume(d.spawn, spawn)
+
+    (prog.experience, prog.level, prog.exp_to_next, prog.upgrade_active, prog.selected_upgrade,
+     damage, fire_rate, projectile_speed, move_speed) = r.unpack(_PROGRESSION)
+    prog.stats.update({'damage': damage, 'fire_rate': fire_rate, 'projectile_speed': projectile_speed,
+                       'move_speed': move_speed})
+    prog.upgrade_options = [prog.upgrade_pool[i] for i in r.array('b')]
+    (combat.projectile_damage,) = r.unpack(_COMBAT)
+    (world.game_over,) = r.unpack(_WORLD)
+
+    # RNG streams
+    names = r.array('B').tobytes().decode()
+    for name in names.split("\0") if names else ():
+        internal = tuple(r.array('I'))
+        has_gauss, gauss = r.unpack(_RNG_TAIL)
+        rng.stream(name).setstate((3, internal, gauss if has_gauss else None))
+
+
+def save(world, path):
+    data = snapshot(world)
+    with open(path, 'wb') as f:
+        f.write(data)
+    print(f"Snapshot written to {path} ({len(data)} bytes)")
+
+
+def load(world, path):
+    with open(path, 'rb') as f:
+        restore(world, f.read())
+    print(f"Snapshot restored from {path}")
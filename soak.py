@@ -0,0 +1,211 @@
+"""
+Chainfall - Soak test (long simulated sessions, headless, as fast as possible)
+
+Runs the desktop World with a scripted, auto-firing player on the dummy SDL
+video driver, samples frame cost, memory and entity counts at intervals,
+and exits non-zero if any of them trends upward beyond the tolerance.
+
+    python soak.py --hours 2
+    python soak.py --minutes 10 --no-draw      # quick CI run
+"""
+import argparse
+import csv
+import gc
+import math
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+import rng
+from world import World
+from asset_loader import AssetLoader
+from memtrack import MemoryTracker, sample_counts
+from config import SCREEN_WIDTH, SCREEN_HEIGHT, FPS, BG_COLOR
+
+# Absolute change below which a metric is never reported as growing,
+# so near-zero counts and sub-microsecond timings do not trip the check
+_NOISE_FLOOR = {
+    'frame_ms': 0.1,
+    'traced_kib': 256,
+    'gc_objects': 1000,
+    # Fixed-capacity effect pool: occupancy follows the hit rate and cannot leak
+    'effects': 32,
+    'damage_numbers': 32,
+}
+_DEFAULT_NOISE_FLOOR = 2
+
+
+class ScriptedKeys:
+    """Stands in for pygame.key.get_pressed(): sweeps left and right, always firing."""
+    def __init__(self, sweep_period=4.0):
+        self.sweep_period = sweep_period
+        self.time = 0.0
+        self.pressed = set()
+
+    def advance(self, dt, player):
+        self.time += dt
+        target_x = player.screen_width * (0.5 + 0.45 * math.sin(self.time * 2 * math.pi / self.sweep_period))
+        self.pressed = {pygame.K_SPACE}
+        if target_x < player.x - 5:
+            self.pressed.add(pygame.K_LEFT)
+        elif target_x > player.x + 5:
+            self.pressed.add(pygame.K_RIGHT)
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+
+def run_soak(duration, sample_every, draw=True, use_assets=True, trace=False, top=0, log_path=None, seed=1):
+    rng.seed(seed)
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    assets = {}
+    if use_assets:
+        loader = AssetLoader()
+        loader.load_all()
+        assets = loader.assets
+
+    world = World(SCREEN_WIDTH, SCREEN_HEIGHT, assets)
+    keys = ScriptedKeys()
+    # tracemalloc costs several times the frame itself, so it is opt-in
+    memtrack = MemoryTracker(sample_every, None, top, enabled=trace)
+    confirm = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN)
+    restart = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_r)
+
+    dt = 1.0 / FPS
+    ticks = int(duration * FPS)
+    ticks_per_sample = int(sample_every * FPS)
+    samples = []
+    work = 0.0
+    elapsed = 0.0
+    started = time.perf_counter()
+
+    for tick in range(1, ticks + 1):
+        t0 = time.perf_counter()
+
+        # Take the first upgrade offered and restart after game over, through the real input path
+        if world.game_over:
+            world.handle_event(restart)
+        elif world.progression_manager.upgrade_active:
+            world.handle_event(confirm)
+
+        keys.advance(dt, world.player)
+        world.update(dt, keys)
+        if draw:
+            world.draw(screen, BG_COLOR)
+        work += time.perf_counter() - t0
+        elapsed += dt
+
+        if tick % ticks_per_sample == 0:
+            # Uncollected cycles are not leaks; count what survives a full collection
+            gc.collect()
+            if trace:
+                memtrack.elapsed = elapsed
+                row = memtrack.sample(world)
+            else:
+                row = {'time': round(elapsed, 2), 'gc_objects': len(gc.get_objects())}
+                row.update(sample_counts(world))
+            row['frame_ms'] = round(work / ticks_per_sample * 1000.0, 4)
+            row.update(world.counts())
+            work = 0.0
+            samples.append(row)
+            memory = f"{row['traced_kib']}KiB" if trace else f"{row['gc_objects']}objs"
+            print(f"t={row['time']:>7.0f}s  frame={row['frame_ms']:.3f}ms  mem={memory}  "
+                  f"segments={row['segments']}  path={row['path_history']}  proj={row['projectiles']}  "
+                  f"orbs={row['orbs']}  dmg={row['damage_numbers']}")
+
+    memtrack.stop()
+    pygame.quit()
+    if log_path:
+        _write_log(log_path, samples)
+    print(f"Simulated {duration:.0f}s in {time.perf_counter() - started:.1f}s wall time")
+    return samples
+
+
+def _write_log(path, samples):
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(samples[0]) if samples else [])
+        writer.writeheader()
+        writer.writerows(samples)
+
+
+def find_trends(samples, tolerance=0.25):
+    """
+    Compare the mean of the last quarter of samples with the first quarter.
+    Returns {metric: (first, last, slope_per_hour)} for metrics that grew by
+    more than `tolerance` (relative) and more than their noise floor.
+    """
+    if len(samples) < 4:
+        return {}
+    quarter = len(samples) // 4
+    failures = {}
+    for metric in samples[0]:
+        if metric == 'time' or metric == 'peak_kib':
+            continue
+        values = [row[metric] for row in samples]
+        first = sum(values[:quarter]) / quarter
+        last = sum(values[-quarter:]) / quarter
+        floor = _NOISE_FLOOR.get(metric, _DEFAULT_NOISE_FLOOR)
+        if last > first * (1.0 + tolerance) and last - first > floor:
+            failures[metric] = (first, last, _slope([row['time'] for row in samples], values) * 3600.0)
+    return failures
+
+
+def _slope(xs, ys):
+    """Least-squares slope, for reporting."""
+    n = len(xs)
+    mean_x = sum(xs) / n
+    mean_y = sum(ys) / n
+    var = sum((x - mean_x) ** 2 for x in xs)
+    if var == 0:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chainfall long-session soak test")
+    parser.add_argument('--hours', type=float, default=None, help="simulated game time in hours")
+    parser.add_argument('--minutes', type=float, default=None, help="simulated game time in minutes")
+    parser.add_argument('--sample-every', type=float, default=60.0, help="seconds of game time between samples")
+    parser.add_argument('--warmup', type=float, default=120.0, help="seconds of game time ignored by the trend check")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed relative growth, first to last quarter")
+    parser.add_argument('--no-draw', action='store_true', help="skip rendering (simulation cost only)")
+    parser.add_argument('--no-assets', action='store_true', help="use fallback shapes instead of sprites")
+    parser.add_argument('--tracemalloc', action='store_true', help="measure traced memory (several times slower)")
+    parser.add_argument('--top', type=int, default=0, help="with --tracemalloc, print the top N growth lines per sample")
+    parser.add_argument('--log', default=None, help="write samples to this CSV file")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    if args.hours is not None:
+        duration = args.hours * 3600.0
+    elif args.minutes is not None:
+        duration = args.minutes * 60.0
+    else:
+        duration = 3600.0
+
+    samples = run_soak(duration, args.sample_every, not args.no_draw, not args.no_assets,
+                       args.tracemalloc, args.top, args.log, args.seed)
+    warm = [row for row in samples if row['time'] > args.warmup]
+    failures = find_trends(warm, args.tolerance)
+
+    if len(warm) < 4:
+        print("Not enough samples after warmup for a trend check")
+        return 2
+    if not failures:
+        print(f"PASS: no metric grew more than {args.tolerance:.0%} over {len(warm)} samples")
+        return 0
+    print("FAIL: upward trends detected")
+    for metric, (first, last, slope) in failures.items():
+        print(f"  {metric}: {first:.2f} -> {last:.2f} ({slope:+.2f}/hour)")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""
+Chainfall - Telemetry event log
+
+Gameplay and performance events go into one preallocated ring buffer as
+parallel arrays of event code, game time and value, so logging an event
+is three array stores: nothing is allocated or written per event.
+flush() appends what was buffered since the last flush to a JSONL or
+binary file; GameLoop only calls it while nobody is playing (game over,
+suspend, exit). If the ring wraps before a flush, the oldest events are
+overwritten and counted in `dropped`.
+
+Like rng and timers there is one module-level log.
+"""
+import os
+import struct
+import time
+from array import array
+import timers
+from config import TELEMETRY_ENABLED, TELEMETRY_CAPACITY, TELEMETRY_FORMAT
+
+# Event codes. The binary format stores these, so never renumber them.
+HIT = 1                # value: damage dealt
+GROUP_DESTROYED = 2    # value: unused
+ORB_COLLECTED = 3      # value: XP gained
+LEVEL_UP = 4           # value: the new player level
+DIFFICULTY_CHANGE = 5  # value: the new difficulty level
+BUDGET_OVERRUN = 6     # value: the frame's work in ms
+GAME_OVER = 7          # value: the player level reached
+
+NAMES = {
+    HIT: 'hit',
+    GROUP_DESTROYED: 'group_destroyed',
+    ORB_COLLECTED: 'orb_collected',
+    LEVEL_UP: 'level_up',
+    DIFFICULTY_CHANGE: 'difficulty_change',
+    BUDGET_OVERRUN: 'budget_overrun',
+    GAME_OVER: 'game_over',
+}
+
+# Binary files are a sequence of blocks, one per flush: a header, then the
+# codes ('B'), times ('d') and values ('d') of `count` events, oldest first.
+MAGIC = b'CFTL'
+VERSION = 1
+HEADER = struct.Struct('<4sHI')  # magic, version, event count
+
+
+class EventLog:
+    def __init__(self, capacity=4096, enabled=False):
+        self.capacity = capacity
+        self.enabled = enabled
+        self.codes = array('B', [0]) * capacity
+        self.times = array('d', [0.0]) * capacity
+        self.values = array('d', [0.0]) * capacity
+        self.head = 0     # Next slot to write
+        self.count = 0    # Events logged since the last flush, including overwritten ones
+        self.dropped = 0  # Events overwritten before they were flushed
+
+    def log(self, code, value=0.0):
+        if not self.enabled:
+            return
+        head = self.head
+        self.codes[head] = code
+        self.times[head] = timers.now()
+        self.values[head] = value
+        head += 1
+        self.head = 0 if head == self.capacity else head
+        self.count += 1
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def columns(self):
+        """(codes, times, values) of the buffered events, oldest first, as new arrays."""
+        slots = range(self.head - len(self), self.head)  # Negative indices wrap around the ring
+        return tuple(array(column.typecode, [column[i] for i in slots])
+                     for column in (self.codes, self.times, self.values))
+
+    def events(self):
+        """[(code, game time, value), ...], oldest first."""
+        return list(zip(*self.columns()))
+
+    def flush(self, path, fmt='jsonl'):
+        """Append the buffered events to path and empty the buffer. Returns how many were written."""
+        written = len(self)
+        if not written:
+            return 0
+        self.dropped += self.count - written
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if fmt == 'binary':
+            with open(path, 'ab') as f:
+                f.write(HEADER.pack(MAGIC, VERSION, written))
+                for column in self.columns():
+                    column.tofile(f)
+        else:
+            import json
+            with open(path, 'a') as f:
+                for code, at, value in self.events():
+                    f.write(json.dumps({'event': NAMES.get(code, code), 'time': round(at, 4), 'value': value}))
+                    f.write("\n")
+        self.count = 0
+        return written
+
+
+def load(path):
+    """Every event in a binary telemetry file, as [(code, game time, value), ...]."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    events = []
+    offset = 0
+    while offset < len(data):
+        magic, version, count = HEADER.unpack_from(data, offset)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a Chainfall telemetry file")
+        if version != VERSION:
+            raise ValueError(f"{path} is telemetry version {version}, expected {VERSION}")
+        offset += HEADER.size
+        columns = []
+        for typecode in 'Bdd':
+            column = array(typecode)
+            size = column.itemsize * count
+            column.frombytes(data[offset:offset + size])
+            offset += size
+            columns.append(column)
+        events.extend(zip(*columns))
+    return events
+
+
+_log = EventLog(TELEMETRY_CAPACITY, TELEMETRY_ENABLED)
+_path = None  # Chosen on the first flush, then appended to for the rest of the session
+
+
+def log(code, value=0.0):
+    _log.log(code, value)
+
+
+def flush():
+    """Write out everything buffered; for quiet moments only, never mid-game."""
+    global _path
+    if not len(_log):
+        return 0
+    if _path is None:
+        extension = '.cft' if TELEMETRY_FORMAT == 'binary' else '.jsonl'
+        _path = time.strftime("telemetry/session_%Y%m%d_%H%M%S") + extension
+    written = _log.flush(_path, TELEMETRY_FORMAT)
+    print(f"Telemetry: {written} events written to {_path} ({_log.dropped} dropped so far)")
+    return written
@@ -0,0 +1,31 @@
+"""
+Chainfall - A warmed SegmentPool covers the snake at its steady-state length
+"""
+import timers
+from config import SNAKE_MAX_SEGMENTS
+from entity_core import BoneSnake
+from memtrack import count_live_objects
+
+
+def _step(snake, frames, dt=1 / 60):
+    for _ in range(frames):
+        timers.advance(dt)
+        snake.update(dt)
+
+
+def test_spawning_stops_allocating_after_warm_up():
+    timers.reset()
+    snake = BoneSnake(480, 800)
+    warmed = count_live_objects()
+
+    while len(snake.segments) < SNAKE_MAX_SEGMENTS:
+        _step(snake, 60)
+    assert count_live_objects() == warmed
+
+    # Kills send groups back to the pool and the snake regrows from it
+    for _ in range(10):
+        snake.remove_segment(snake.segments[len(snake.segments) // 2])
+        snake.remove_segment(snake.segments[-1])
+        _step(snake, 600)
+        assert count_live_objects() == warmed
+    assert len(snake.segments) == SNAKE_MAX_SEGMENTS
@@ -0,0 +1,24 @@
+"""
+Chainfall - MemoryTracker leaves tracemalloc as it found it
+"""
+import tracemalloc
+
+from memtrack import MemoryTracker
+
+
+def test_stop_keeps_tracing_started_elsewhere():
+    tracemalloc.start()
+    try:
+        tracker = MemoryTracker(enabled=True)
+        tracker.stop()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+
+def test_stop_ends_its_own_tracing():
+    assert not tracemalloc.is_tracing()
+    tracker = MemoryTracker(enabled=True)
+    assert tracemalloc.is_tracing()
+    tracker.toggle()
+    assert not tracemalloc.is_tracing()
@@ -0,0 +1,53 @@
+"""
+Chainfall - Orb merging keeps every point of XP alive for a full lifetime
+"""
+import timers
+from progression import OrbField, ProgressionManager
+
+
+def _manager():
+    timers.reset()
+    return ProgressionManager(480, 800)
+
+
+def test_merge_into_old_orb_restamps_it():
+    pm = _manager()
+    orbs = pm.orbs
+    pm.spawn_orb(100, 100, 10)
+    pm.spawn_orb(300, 100, 5)  # Out of merge range: a second, equally old orb
+
+    timers.advance(OrbField.lifetime - 0.1)  # First orb is about to expire
+    pm.spawn_orb(105, 100, 20)
+    assert len(orbs) == 2
+    assert list(orbs.values) == [5, 30]  # Merged orb moved behind the older one
+    assert orbs.born[-1] == timers.now()
+    assert list(orbs.born) == sorted(orbs.born)
+
+    timers.advance(0.2)  # Past the original orbs' lifetime
+    orbs.expire(timers.now())
+    assert list(orbs.values) == [30]  # The new XP is still there
+
+    timers.advance(OrbField.lifetime)
+    orbs.expire(timers.now())
+    assert len(orbs) == 0
+
+
+def test_merge_in_the_same_tick_stays_in_place():
+    pm = _manager()
+    orbs = pm.orbs
+    pm.spawn_orb(100, 100, 10)
+    pm.spawn_orb(300, 100, 5)
+    pm.spawn_orb(104, 100, 7)
+    assert list(orbs.values) == [17, 5]
+    assert list(orbs.xs) == [100, 300]
+
+
+def test_merge_orbs_keeps_total_and_newest_birth():
+    pm = _manager()
+    orbs = pm.orbs
+    orbs.add(10, 10, 3)
+    timers.advance(1.0)
+    orbs.add(12, 12, 4)
+    pm.merge_orbs()
+    assert list(orbs.values) == [7]
+    assert list(orbs.born) == [1.0]
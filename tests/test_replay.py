@@ -0,0 +1,25 @@
+"""
+Chainfall - Replay logs keep every key press of a tick, in order
+"""
+import pygame
+import replay
+
+
+def test_pressed_keys_round_trip_in_order(tmp_path):
+    keys = (pygame.K_RIGHT, pygame.K_RIGHT, pygame.K_RETURN, pygame.K_r, pygame.K_RIGHT)
+    events = [pygame.event.Event(pygame.KEYDOWN, key=key) for key in keys]
+    events.insert(2, pygame.event.Event(pygame.KEYDOWN, key=pygame.K_F5))  # Debug key: not game input
+    events.insert(3, pygame.event.Event(pygame.KEYUP, key=pygame.K_RIGHT))
+
+    path = str(tmp_path / "order.cfr")
+    recorder = replay.Recorder(path, seed=7, fps=60)
+    recorder.record(1 / 60, 0, replay.pressed_keys(events), 0, 1234)
+    recorder.record(1 / 60, 1, b'', 2, 5678)
+    recorder.close()
+
+    seed, fps, ticks = replay.load(path)
+    assert (seed, fps, len(ticks)) == (7, 60, 2)
+    (dt, held, pressed, level, checksum), second = ticks
+    assert [event.key for event in replay.pressed_events(pressed)] == list(keys)
+    assert (held, level, checksum) == (0, 0, 1234)
+    assert second[1:] == (1, b'', 2, 5678)
@@ -0,0 +1,143 @@
+"""
+Chainfall - Countdown timers on a shared timer wheel
+
+Objects own Timer instances and start() them instead of decrementing a
+float every frame. The wheel hashes each running timer into a bucket by
+its deadline, and advance(dt) only visits the buckets the clock passed
+over, so a tick costs time in proportion to the timers that expire, not
+to how many objects exist.
+
+Like rng, there is one module-level wheel: World.update advances it while
+the game is unpaused and World() resets it. Deadlines are absolute game
+times, which is what snapshots store.
+"""
+from config import FPS
+
+_RESOLUTION = 1.0 / FPS
+_SLOTS = 512
+
+
+class TimerWheel:
+    def __init__(self, resolution=_RESOLUTION, slots=_SLOTS):
+        self.resolution = resolution
+        self.slots = slots
+        self.reset()
+
+    def reset(self, now=0.0):
+        """Drop every queued timer and set the clock. Timers still held by objects read as stopped."""
+        for bucket in getattr(self, '_buckets', ()):
+            for timer in bucket:
+                timer._clear()
+        self.now = now
+        self._tick = int(now / self.resolution)
+        self._buckets = [[] for _ in range(self.slots)]
+        self._seq = 0
+
+    def insert(self, timer):
+        tick = max(int(timer.deadline / self.resolution), self._tick)
+        timer._tick = tick
+        timer._wheel = self
+        self._buckets[tick % self.slots].append(timer)
+
+    def advance(self, dt):
+        self.now += dt
+        now = self.now
+        last = int(now / self.resolution)
+        slots = self.slots
+        fired = []
+
+        # A jump longer than a full turn still only needs one visit per bucket
+        first = max(self._tick, last - slots + 1)
+        for tick in range(first, last + 1):
+            bucket = self._buckets[tick % slots]
+            if not bucket:
+                continue
+            keep = []
+            for timer in bucket:
+                if timer.deadline is None:
+                    timer._tick = None  # Stopped since it was queued
+                elif timer.deadline <= now:
+                    fired.append(timer)
+                else:
+                    target = int(timer.deadline / self.resolution)
+                    timer._tick = target
+                    if target % slots == tick % slots:
+                        keep.append(timer)  # Later turn of the wheel, or later in this tick
+                    else:
+                        self._buckets[target % slots].append(timer)
+            self._buckets[tick % slots] = keep
+        self._tick = last
+
+        if not fired:
+            return
+        # Same order every run, whatever order the buckets held them in
+        fired.sort(key=lambda t: (t.deadline, t._seq))
+        for timer in fired:
+            timer._clear()
+        for timer in fired:
+            if timer.callback is not None:
+                timer.callback()
+
+    def next_seq(self):
+        self._seq += 1
+        return self._seq
+
+
+_wheel = TimerWheel()
+
+
+class Timer:
+    """A re-armable countdown. running is True from start() until it expires or is stopped."""
+    __slots__ = ('callback', 'deadline', 'running', '_tick', '_wheel', '_seq')
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.deadline = None
+        self.running = False
+        self._tick = None  # Bucket the timer is queued in, None if not queued
+        self._wheel = None
+        self._seq = 0
+
+    def start(self, delay):
+        self.start_at(_wheel.now + delay)
+
+    def start_at(self, deadline):
+        self.deadline = deadline
+        self.running = True
+        self._seq = _wheel.next_seq()
+        target = max(int(deadline / _wheel.resolution), _wheel._tick)
+        if self._tick is not None and self._wheel is _wheel:
+            if target >= self._tick:
+                return  # Still queued earlier than needed; advance() moves it along
+            _wheel._buckets[self._tick % _wheel.slots].remove(self)
+        _wheel.insert(self)
+
+    def stop(self):
+        self.deadline = None
+        self.running = False
+
+    def remaining(self):
+        return self.deadline - _wheel.now if self.running else 0.0
+
+    def _clear(self):
+        self.deadline = None
+        self.running = False
+        self._tick = None
+        self._wheel = None
+
+
+def now():
+    return _wheel.now
+
+
+def advance(dt):
+    _wheel.advance(dt)
+
+
+def reset(now=0.0):
+    _wheel.reset(now)
+
+
+def pending():
+    """Queued timer entries, including stopped ones not yet swept out."""
+    return sum(len(bucket) for bucket in _wheel._buckets)
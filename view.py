@@ -0,0 +1,36 @@
+"""
+Chainfall - Render scale
+
+The simulation always works in SCREEN_WIDTH x SCREEN_HEIGHT units. Drawing
+happens on a surface `scale` times that size: GameLoop opens the display
+at the reduced size with pygame.SCALED, so SDL stretches it to the window
+and every fill and blit touches fewer pixels. Draw code multiplies
+positions and lengths by scale; sprites and fonts are created at scaled
+sizes up front. At 1.0 every mapping is the identity.
+
+Like rng and timers this is module state, set once before anything is
+drawn or loaded.
+"""
+import pygame
+from config import RENDER_SCALE, SCREEN_WIDTH, SCREEN_HEIGHT
+
+scale = RENDER_SCALE
+
+
+def set_scale(value):
+    global scale
+    scale = value
+
+
+def size(width, height):
+    """Pixel size of something width x height units big (never below 1x1)."""
+    return (max(1, round(width * scale)), max(1, round(height * scale)))
+
+
+def screen_size():
+    return size(SCREEN_WIDTH, SCREEN_HEIGHT)
+
+
+def font(points):
+    """The default font at `points`, scaled."""
+    return pygame.font.Font(None, max(1, round(points * scale)))
@@ -0,0 +1,190 @@
+"""
+Chainfall - Game world (managers and the per-frame simulation step)
+"""
+import pygame
+import telemetry
+import timers
+import view
+from player import Player
+from projectile import ProjectileManager
+from entity_core import EntityManager
+from combat import CombatManager
+from progression import ProgressionManager
+from difficulty import DifficultyManager
+from profiler import FrameProfiler, collect_counts
+from parallel import Scheduler, Step, Task
+
+
+class World:
+    """
+    Owns every manager and runs one simulation step. Kept free of window and
+    clock handling so the game loop and headless harnesses drive the same code.
+    """
+    def __init__(self, screen_width, screen_height, assets=None, profiler=None, scheduler=None):
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.assets = assets if assets is not None else {}
+        self.profiler = profiler if profiler is not None else FrameProfiler()
+        self.scheduler = scheduler if scheduler is not None else Scheduler()
+        self.step = Step(self._step_tasks())
+        self._hits = []
+
+        # A new world starts a new game clock
+        timers.reset()
+        self.player = Player(screen_width, screen_height, self.assets.get('player'))
+        self.projectile_manager = ProjectileManager(self.assets.get('projectile'))
+        self.entity_manager = EntityManager(screen_width, screen_height, self.assets.get('enemy'),
+                                            self.assets.get('enemy_head'))
+        self.combat_manager = CombatManager()
+        self.progression_manager = ProgressionManager(screen_width, screen_height, self.assets.get('orb'))
+        self.difficulty_manager = DifficultyManager()
+
+        # Spawn initial enemy
+        self.entity_manager.spawn_entity(self.difficulty_manager.get_spawn_params())
+
+        self.game_over = False
+        self.hud_font = None
+        self.game_over_fonts = None
+
+    def restart(self):
+        """Quick reset after game over: fresh player and snake, progression kept."""
+        # Not timers.reset(), which would also drop the difficulty spawn timer that carries over
+        self.player.fire_cooldown.stop()
+        self.entity_manager.snake.stop_timers()
+        self.player = Player(self.screen_width, self.screen_height, self.assets.get('player'))
+        self.entity_manager = EntityManager(self.screen_width, self.screen_height, self.assets.get('enemy'),
+                                            self.assets.get('enemy_head'))
+        self.entity_manager.spawn_entity(self.difficulty_manager.get_spawn_params())
+        self.game_over = False
+
+    def refresh_assets(self):
+        """Re-fetch every sprite from assets, so owners of one that failed to load switch to their fallback."""
+        assets = self.assets
+        self.player.image = assets.get('player')
+        projectile_image = assets.get('projectile')
+        self.projectile_manager.image = projectile_image
+        for projectile in self.projectile_manager.projectiles:
+            projectile.image = projectile_image
+        self.entity_manager.snake.set_images(assets.get('enemy'), assets.get('enemy_head'))
+        self.progression_manager.orb_image = assets.get('orb')
+
+    def handle_event(self, event):
+        if self.game_over:
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_r:
+                self.restart()
+            return
+        self.progression_manager.handle_input(event, self.player, self.combat_manager)
+
+    def _step_tasks(self):
+        """
+        One simulation step, in order. reads/writes name the state each task
+        touches ('clock' is the game time, 'timers' the timer wheel) so the
+        parallel scheduler knows what may overlap; keep them honest.
+        """
+        return [
+            Task('player', self._update_player, reads={'keys'},
+                 writes={'clock', 'timers', 'player', 'projectiles'}, lap='player.update'),
+            Task('projectiles', self._update_projectiles, writes={'projectiles'}, lap='projectiles.update'),
+            Task('entities', self._update_entities, reads={'clock'}, writes={'snake'}, lap='entities.update'),
+            Task('collisions', self._update_collisions, reads={'clock'},
+                 writes={'timers', 'difficulty', 'projectiles', 'snake', 'effects', 'rng.combat', 'hits', 'telemetry'},
+                 lap='combat.collisions'),
+            Task('effects', self._update_effects, reads={'clock'}, writes={'effects'}),
+            Task('spawns', self._update_spawns, reads={'clock', 'player', 'progression', 'hits'},
+                 writes={'game_over', 'timers', 'difficulty', 'snake', 'orbs', 'telemetry'}, lap='combat.update'),
+            Task('progression', self._update_progression, reads={'clock', 'player'},
+                 writes={'orbs', 'progression', 'rng.progression', 'telemetry'}, lap='progression.update'),
+        ]
+
+    def _update_player(self, dt, keys):
+        timers.advance(dt)
+        self.player.update(dt, keys)
+        self.player.try_fire(self.projectile_manager)
+
+    def _update_projectiles(self, dt, keys):
+        self.projectile_manager.update(dt)
+
+    def _update_entities(self, dt, keys):
+        self.entity_manager.update(dt)
+
+    def _update_collisions(self, dt, keys):
+        self.difficulty_manager.update(dt)
+        self._hits = self.combat_manager.check_collisions(self.projectile_manager, self.entity_manager)
+
+    def _update_effects(self, dt, keys):
+        self.combat_manager.update(dt)
+
+    def _update_spawns(self, dt, keys):
+        entity_manager = self.entity_manager
+        difficulty_manager = self.difficulty_manager
+
+        # Check Game Over
+        if self.combat_manager.check_player_collision(self.player, entity_manager):
+            self.game_over = True
+            telemetry.log(telemetry.GAME_OVER, self.progression_manager.level)
+
+        # Spawn energy orbs from destroyed targets
+        for target in self._hits:
+            if not target.active:
+                self.progression_manager.spawn_orb(target.x, target.y, 15)
+
+        # Spawn new enemies based on difficulty
+        current_count = len(entity_manager.get_entities())
+        if difficulty_manager.should_spawn() and current_count < difficulty_manager.max_enemies:
+            entity_manager.spawn_entity(difficulty_manager.get_spawn_params())
+
+        # Always have at least one enemy
+        if current_count == 0:
+            entity_manager.spawn_entity(difficulty_manager.get_spawn_params())
+
+    def _update_progression(self, dt, keys):
+        self.progression_manager.update(dt, self.player)
+
+    def update(self, dt, keys):
+        if self.game_over:
+            return
+
+        # Update (pause if upgrade screen active)
+        if not self.progression_manager.upgrade_active:
+            self.scheduler.run(self.step, dt, keys, self.profiler)
+        else:
+            self._update_progression(dt, keys)
+            self.profiler.lap('progression.update')
+
+    def draw(self, screen, bg_color):
+        profiler = self.profiler
+
+        screen.fill(bg_color)
+        self.entity_manager.draw(screen)
+        profiler.lap('entities.draw')
+        self.projectile_manager.draw(screen)
+        profiler.lap('projectiles.draw')
+        self.player.draw(screen)
+        profiler.lap('player.draw')
+        self.combat_manager.draw(screen)
+        profiler.lap('combat.draw')
+        self.progression_manager.draw(screen)
+        profiler.lap('progression.draw')
+
+        # Draw difficulty indicator
+        if self.hud_font is None:
+            self.hud_font = view.font(24)
+        diff_text = self.hud_font.render(f"Wave {self.difficulty_manager.get_difficulty_level()}", True, (150, 150, 150))
+        screen.blit(diff_text, (screen.get_width() - diff_text.get_width() - 20 * view.scale, 40 * view.scale))
+
+        if self.game_over:
+            self.draw_game_over(screen)
+
+    def draw_game_over(self, screen):
+        if self.game_over_fonts is None:
+            self.game_over_fonts = (view.font(74), view.font(36))
+        title_font, sub_font = self.game_over_fonts
+        center_x, center_y = screen.get_width() / 2, screen.get_height() / 2
+
+        text = title_font.render("GAME OVER", True, (255, 50, 50))
+        screen.blit(text, text.get_rect(center=(center_x, center_y)))
+        sub_text = sub_font.render("Press R to Restart", True, (200, 200, 200))
+        screen.blit(sub_text, sub_text.get_rect(center=(center_x, center_y + 50 * view.scale)))
+
+    def counts(self):
+        return collect_counts(self.entity_manager, self.projectile_manager, self.progression_manager, self.combat_manager)